@@ -0,0 +1,12 @@
+"""
+Корень репозитория в sys.path, чтобы модули лабораторной могли
+импортировать общий пакет utils при запуске из её каталога.
+Импортируется один раз перед "from utils ...": import _paths.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
@@ -0,0 +1,99 @@
+"""
+Сетки в файлах (np.memmap) и контрольные точки для долгих расчётов Lab_10.
+
+Сетка хранится в файле и отображается в память, поэтому N x N может быть
+больше оперативной памяти: ОС держит в памяти только используемые страницы.
+
+Контрольная точка - файл checkpoint_<итерация>.npy с текущей сеткой и
+checkpoint.json с метаданными (итерация, max_diff, метод, время). Запись
+атомарна: данные и метаданные пишутся во временные файлы, сбрасываются на
+диск (fsync) и переименовываются (os.replace). checkpoint.json всегда
+ссылается на полностью записанный файл сетки; старые файлы удаляются
+только после переключения ссылки. Поэтому прерывание в любой момент
+оставляет последнюю целую контрольную точку.
+"""
+
+import glob
+import json
+import os
+import time
+
+import numpy as np
+
+METADATA_FILE = "checkpoint.json"
+CHUNK_ROWS = 1024  # Строк за одно копирование (ограничивает временную память)
+
+
+def allocate_grid(shape, path=None):
+    """Нулевая сетка: в памяти или (path задан) в файле через np.memmap."""
+    if path is None:
+        return np.zeros(shape)
+    return np.memmap(path, dtype=np.float64, mode="w+", shape=shape)
+
+
+def copy_rows(src, dst):
+    """Копирует src в dst полосами строк (без полной копии в памяти)."""
+    for r in range(0, src.shape[0], CHUNK_ROWS):
+        dst[r:r + CHUNK_ROWS] = src[r:r + CHUNK_ROWS]
+
+
+def _fsync(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _replace(tmp, path):
+    """Атомарная замена path на полностью записанный tmp."""
+    _fsync(tmp)
+    os.replace(tmp, path)
+    try:
+        # Переименование тоже должно попасть на диск
+        _fsync(os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        pass
+
+
+def save_checkpoint(directory, u, **metadata):
+    """
+    Атомарно сохраняет сетку u и метаданные (iteration обязателен).
+    Возвращает путь к файлу сетки.
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = f"checkpoint_{int(metadata['iteration']):012d}.npy"
+    path = os.path.join(directory, name)
+
+    tmp = path + ".tmp"
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float64, shape=u.shape)
+    copy_rows(u, out)
+    out.flush()
+    del out
+    _replace(tmp, path)
+
+    meta_path = os.path.join(directory, METADATA_FILE)
+    meta = dict(metadata, file=name, shape=list(u.shape), saved_at=time.time())
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, ensure_ascii=False, indent=2)
+    _replace(meta_path + ".tmp", meta_path)
+
+    # Старые контрольные точки больше не нужны
+    for old in glob.glob(os.path.join(directory, "checkpoint_*.npy*")):
+        if os.path.basename(old) != name:
+            os.remove(old)
+    return path
+
+
+def load_checkpoint(directory):
+    """
+    Последняя контрольная точка: (метаданные, сетка только для чтения
+    через memmap) или None, если ее нет.
+    """
+    meta_path = os.path.join(directory, METADATA_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as fh:
+        meta = json.load(fh)
+    u = np.load(os.path.join(directory, meta["file"]), mmap_mode="r")
+    return meta, u
@@ -0,0 +1,390 @@
+"""
+Геометрический многосеточный метод для задачи Дирихле Lab_10:
+
+    -Δu = f  в квадрате,  u = g  на границе  (сетка N x N, h = 1 / (N - 1)).
+
+Составные части:
+    - сглаживание красно-черным Зейделем/ПВР (red_black_sweep из poisson_solver);
+    - сужение невязки полным взвешиванием (full weighting, шаблон 1/16 [1 2 1; 2 4 2; 1 2 1]);
+    - продолжение поправки билинейной интерполяцией;
+    - для N, не равных 2^k + 1, - те же операции на невложенных сетках;
+    - прямое решение (разреженное LU) на самой грубой сетке;
+    - расписания V-цикл и полный многосеточный метод (FMG).
+
+Сетки уровней: N_{l+1} = ceil((N_l - 1) / 2) + 1 узлов на той же области.
+При четном N_l - 1 грубая сетка вложена в мелкую (каждый второй узел), и
+используются быстрые ядра restrict/prolong_add. При нечетном N_l - 1 шаг
+грубой сетки h_{l+1} = h_l (N_l - 1) / (N_{l+1} - 1) чуть больше 2 h_l, узлы
+не совпадают; тогда продолжение - (поли)линейная интерполяция между
+равномерными сетками (interpolation_matrix вдоль каждой оси), а сужение -
+транспонированная к ней матрица с нормировкой строк (при вложенных сетках
+это в точности полное взвешивание). Число циклов до заданной
+относительной невязки не зависит от N, а один цикл стоит O(N^2) операций.
+
+На каждом уровне хранится масштабированная правая часть b = h^2 f во
+внутренних узлах - в том же виде, что принимает red_black_sweep. Тогда
+для масштабированной невязки r = b + (сумма соседей - 4 u) правая часть
+грубой сетки равна b_c = h_c^2 R(r / h^2) = (h_c / h)^2 R(r) (= 4 R(r) при
+вложенных сетках).
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+import _paths  # корень репозитория в sys.path (для utils)
+from utils.convergence import ConvergenceMonitor, ConvergenceReport
+from poisson_solver import BoundaryConditions, red_black_buffers, red_black_sweep
+
+SCHEDULES = ("v", "fmg")
+
+
+@dataclass
+class MultigridResult(ConvergenceReport):
+    """
+    Итог многосеточного расчёта; iterations - число циклов, last_value -
+    последняя относительная невязка ||f + Δ_h u||_inf / ||r_0||_inf.
+    """
+    u: np.ndarray = None
+    residuals: list = field(default_factory=list)          # ||f + Δ_h u||_inf после каждого цикла
+    reduction_factors: list = field(default_factory=list)  # r_k / r_{k-1}
+    levels: int = 0
+    method: str = ""
+
+
+def residual(u, b, out, scratch):
+    """Масштабированная невязка r = b + (сумма соседей - 4 u) во внутренних узлах."""
+    np.add(u[2:, 1:-1], u[:-2, 1:-1], out=out)
+    np.add(out, u[1:-1, 2:], out=out)
+    np.add(out, u[1:-1, :-2], out=out)
+    np.add(out, b, out=out)
+    np.multiply(u[1:-1, 1:-1], 4.0, out=scratch)
+    np.subtract(out, scratch, out=out)
+    return out
+
+
+def restrict(r, out, tmp):
+    """
+    Полное взвешивание: внутренние узлы мелкой сетки (2 n + 1)^2 ->
+    внутренние узлы грубой n^2. tmp - буфер формы (n, 2 n + 1).
+    """
+    # По строкам: [1 2 1] / 4, затем по столбцам - тот же шаблон
+    np.add(r[0:-2:2], r[2::2], out=tmp)
+    tmp += r[1:-1:2]
+    tmp += r[1:-1:2]
+    np.add(tmp[:, 0:-2:2], tmp[:, 2::2], out=out)
+    out += tmp[:, 1:-1:2]
+    out += tmp[:, 1:-1:2]
+    out *= 1.0 / 16.0
+    return out
+
+
+def prolong_add(e, u, buf):
+    """
+    Билинейная интерполяция поправки e (сетка n x n с нулевой границей)
+    на сетку (2n - 1) x (2n - 1) с прибавлением к u. buf - плоский буфер
+    длины не меньше n^2.
+    """
+    n = e.shape[0]
+    u[::2, ::2] += e
+    t = buf[:(n - 1) * n].reshape(n - 1, n)
+    np.add(e[:-1], e[1:], out=t)
+    t *= 0.5
+    u[1::2, ::2] += t                     # нечетные строки, четные столбцы
+    t = buf[:(n - 1) * (n - 1)].reshape(n - 1, n - 1)
+    # нечетные строки и столбцы: среднее четырех узлов
+    np.add(e[:-1, :-1], e[1:, :-1], out=t)
+    t += e[:-1, 1:]
+    t += e[1:, 1:]
+    t *= 0.25
+    u[1::2, 1::2] += t
+    t = buf[:n * (n - 1)].reshape(n, n - 1)
+    np.add(e[:, :-1], e[:, 1:], out=t)
+    t *= 0.5
+    u[::2, 1::2] += t                     # четные строки, нечетные столбцы
+    return u
+
+
+def laplacian_matrix(n):
+    """Матрица пятиточечного оператора (4 u - сумма соседей) для n x n внутренних узлов."""
+    T = sp.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(n, n))
+    I = sp.identity(n)
+    return (sp.kron(I, T) + sp.kron(T, I)).tocsc()
+
+
+def interpolation_matrix(N, Nc):
+    """
+    Линейная интерполяция с равномерной сетки из Nc узлов на равномерную
+    сетку из N узлов того же отрезка: разреженная матрица N x Nc.
+    """
+    i = np.arange(N)
+    t = i * (Nc - 1) / (N - 1)
+    J = np.minimum(t.astype(int), Nc - 2)
+    w = t - J
+    P = sp.coo_matrix((np.concatenate([1.0 - w, w]),
+                       (np.concatenate([i, i]), np.concatenate([J, J + 1]))), shape=(N, Nc))
+    P = P.tocsr()
+    P.eliminate_zeros()
+    return P
+
+
+def apply_along_axes(M, a):
+    """Применяет матрицу M вдоль каждой оси массива a (тензорное произведение)."""
+    for axis in range(a.ndim):
+        a = np.moveaxis(a, axis, 0)
+        shape = a.shape
+        a = (M @ a.reshape(shape[0], -1)).reshape((M.shape[0],) + shape[1:])
+        a = np.moveaxis(a, 0, axis)
+    return a
+
+
+def _faces(ndim):
+    """Индексы граней (сторон) сетки размерности ndim."""
+    full = (slice(None),) * ndim
+    return [full[:axis] + (idx,) + full[axis + 1:] for axis in range(ndim) for idx in (0, -1)]
+
+
+class _Level:
+    """Массивы одного уровня: u (с границей), b и r (внутренние узлы)."""
+
+    def __init__(self, solver, N, h, u=None):
+        shape, inner = (N,) * solver.ndim, (N - 2,) * solver.ndim
+        self.N, self.h = N, h
+        self.u = np.zeros(shape) if u is None else u
+        self.b = np.zeros(inner)
+        self.r = np.empty(inner)
+        self.scratch = None     # буфер двумерной невязки (создается по запросу)
+        self.buffers = solver._smoother_buffers(N)
+        self.lu = None
+        # Переход к следующему уровню при невложенных сетках (иначе None)
+        self.prolongation = self.restriction = self.injection = None
+
+    def link(self, coarse):
+        """Матрицы перехода к невложенной грубой сетке coarse."""
+        P = interpolation_matrix(self.N, coarse.N)
+        self.prolongation = P
+        R = P[1:-1, 1:-1].T.tocsr()
+        self.restriction = sp.diags(1.0 / np.asarray(R.sum(axis=1)).ravel()) @ R
+        self.injection = interpolation_matrix(coarse.N, self.N)
+
+
+class MultigridSolver:
+    """
+    Многосеточный решатель задачи Дирихле на сетке N x N.
+
+    Цикл и расписания не зависят от размерности; ядра (сглаживание,
+    невязка, сужение, продолжение, матрица грубой сетки) - методы класса,
+    которые переопределяет трехмерный MultigridSolver3D (poisson3d.py).
+
+    Args:
+        N, boundary, f, h, u0: как в PoissonSolver (граничные условия -
+            BoundaryConditions, по умолчанию те же, что в PoissonSolverGUI).
+        pre_smooth, post_smooth: число красно-черных шагов до и после
+            грубосеточной поправки.
+        omega: параметр сглаживателя (1.0 - Зейдель).
+        coarsest: огрубление прекращается, когда N уровня не больше coarsest.
+    """
+
+    ndim = 2
+    boundary_class = BoundaryConditions
+
+    def __init__(self, N=None, boundary=None, f=None, h=None, u0=None,
+                 pre_smooth=2, post_smooth=2, omega=1.0, coarsest=17):
+        if u0 is not None:
+            u0 = np.array(u0, dtype=float)
+            N = u0.shape[0]
+            if u0.shape != (N,) * self.ndim:
+                raise ValueError("Начальная сетка должна иметь одинаковый размер по всем осям")
+        if N is None or N < 3:
+            raise ValueError("Сетка должна содержать хотя бы один внутренний узел")
+        if u0 is None:
+            u0 = (boundary or self.boundary_class()).apply(np.zeros((N,) * self.ndim))
+        self.N = N
+        self.h = 1.0 / (N - 1) if h is None else h
+        self.pre_smooth, self.post_smooth = pre_smooth, post_smooth
+        self.omega = omega
+
+        # Иерархия сеток: уровень 0 - исходная
+        self.levels = [_Level(self, N, self.h, u0)]
+        while self.levels[-1].N > max(coarsest, 3):
+            last = self.levels[-1]
+            Nc = last.N // 2 + 1
+            coarse = _Level(self, Nc, last.h * ((last.N - 1) / (Nc - 1)))
+            if (last.N - 1) % 2:
+                last.link(coarse)
+            self.levels.append(coarse)
+        self._tmp = [np.empty(((lev.N - 1) // 2 - 1, lev.N - 2)) if lev.prolongation is None
+                     else None for lev in self.levels[:-1]]
+        self._buf = np.empty((N // 2 + 1) ** 2)
+
+        fine = self.levels[0]
+        if f is not None:
+            if callable(f):
+                # f получает координаты (x, y[, z]) - оси массива в обратном порядке
+                coords = np.mgrid[(slice(0, N),) * self.ndim] * self.h
+                f = f(*coords[::-1])
+            f = np.broadcast_to(np.asarray(f, dtype=float), (N,) * self.ndim)
+            np.multiply(f[(slice(1, -1),) * self.ndim], self.h ** 2, out=fine.b)
+        self._b0 = fine.b.copy()   # уровень 0 правой части (грубые b перезаписываются)
+
+    @property
+    def u(self):
+        return self.levels[0].u
+
+    # --- Ядра (двумерные; MultigridSolver3D переопределяет) ---
+
+    def _smoother_buffers(self, N):
+        return red_black_buffers(N)
+
+    def _smooth(self, lev, steps):
+        for _ in range(steps):
+            red_black_sweep(lev.u, lev.b, self.omega, lev.buffers, compute_diff=False)
+
+    def _residual(self, lev):
+        if lev.scratch is None:
+            lev.scratch = np.empty_like(lev.r)
+        return residual(lev.u, lev.b, lev.r, lev.scratch)
+
+    def _restrict(self, l, r, out):
+        """Сужение r с уровня l на уровень l + 1 (в out)."""
+        return restrict(r, out, self._tmp[l])
+
+    def _prolong_add(self, e, u):
+        return prolong_add(e, u, self._buf)
+
+    def _laplacian(self, n):
+        return laplacian_matrix(n)
+
+    # --- Составные части цикла ---
+
+    def _coarsen(self, l, r, out):
+        """Правая часть уровня l + 1 по масштабированной невязке r уровня l."""
+        fine, coarse = self.levels[l], self.levels[l + 1]
+        if fine.restriction is None:
+            self._restrict(l, r, out)
+        else:
+            out[...] = apply_along_axes(fine.restriction, r)
+        # Отношение масштабированных правых частей: h_c^2 / h^2 (4 при вложенных сетках)
+        out *= (coarse.h / fine.h) ** 2
+        return out
+
+    def _interpolate_add(self, l, e, u):
+        """Прибавляет к u (уровень l) поправку e с уровня l + 1."""
+        P = self.levels[l].prolongation
+        if P is None:
+            return self._prolong_add(e, u)
+        u += apply_along_axes(P, e)
+        return u
+
+    def _direct(self, lev):
+        """Прямое решение на уровне lev с текущими граничными значениями lev.u."""
+        n = lev.N - 2
+        interior = (slice(1, -1),) * self.ndim
+        if lev.lu is None:
+            lev.lu = splu(self._laplacian(n))
+        # Правая часть: b плюс вклад границы = невязка при нулевых внутренних узлах
+        lev.u[interior] = 0.0
+        rhs = self._residual(lev)
+        lev.u[interior] = lev.lu.solve(rhs.ravel()).reshape(rhs.shape)
+
+    def _cycle(self, l):
+        """V-цикл на уровне l (решение уравнения с правой частью levels[l].b)."""
+        lev = self.levels[l]
+        if l == len(self.levels) - 1:
+            self._direct(lev)
+            return
+        coarse = self.levels[l + 1]
+        self._smooth(lev, self.pre_smooth)
+        self._residual(lev)
+        self._coarsen(l, lev.r, coarse.b)
+        coarse.u.fill(0.0)
+        self._cycle(l + 1)
+        self._interpolate_add(l, coarse.u, lev.u)
+        self._smooth(lev, self.post_smooth)
+
+    def _fmg(self):
+        """
+        Полный многосеточный метод: правая часть и граница переносятся на
+        грубые сетки, грубое решение интерполируется на следующий уровень и
+        уточняется одним V-циклом.
+        """
+        levels = self.levels
+        faces = _faces(self.ndim)
+        every_other = (slice(None, None, 2),) * self.ndim
+        for l in range(1, len(levels)):
+            fine, coarse = levels[l - 1], levels[l]
+            self._coarsen(l - 1, fine.b, coarse.b)
+            # Граничные значения - инъекцией (интерполяцией для невложенных сеток)
+            if fine.injection is None:
+                values = fine.u[every_other]
+            else:
+                values = apply_along_axes(fine.injection, fine.u)
+            coarse.u.fill(0.0)
+            for face in faces:
+                coarse.u[face] = values[face]
+        self._direct(levels[-1])
+        for l in range(len(levels) - 2, -1, -1):
+            fine, coarse = levels[l], levels[l + 1]
+            boundary = [fine.u[face].copy() for face in faces]
+            fine.u[(slice(1, -1),) * self.ndim] = 0.0
+            # Граница грубого решения интерполируется тоже, поэтому
+            # ее исходные значения восстанавливаются после продолжения
+            self._interpolate_add(l, coarse.u, fine.u)
+            for face, values in zip(faces, boundary):
+                fine.u[face] = values
+            # Грубые b перезаписываются V-циклом, но этот уровень их уже использовал
+            b_l = fine.b.copy() if l else self._b0
+            self._cycle(l)
+            fine.b[...] = b_l
+
+    def residual_norm(self):
+        """||f + Δ_h u||_inf на исходной сетке."""
+        r = self._residual(self.levels[0])
+        return float(np.abs(r).max()) / self.h ** 2 if r.size else 0.0
+
+    def solve(self, tol=1e-8, max_cycles=50, schedule="v", monitor=None, progress=None):
+        """
+        Циклы до относительной невязки ||r_k||_inf / ||r_0||_inf <= tol.
+
+        schedule="fmg" - первый цикл полный многосеточный (обычно сразу дает
+        точность порядка ошибки дискретизации), дальше V-циклы.
+        progress(cycle, residual, reduction) вызывается после каждого цикла.
+        """
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Неизвестное расписание {schedule!r}, ожидается одно из {SCHEDULES}")
+        monitor = ConvergenceMonitor() if monitor is None else monitor
+        monitor.start()
+        r0 = self.residual_norm()
+        residuals, factors = [r0], []
+        converged = r0 == 0.0
+        cycle = 0
+        while not converged and cycle < max_cycles:
+            cycle += 1
+            if schedule == "fmg" and cycle == 1:
+                self._fmg()
+            else:
+                self._cycle(0)
+            r = self.residual_norm()
+            factors.append(r / residuals[-1] if residuals[-1] else 0.0)
+            residuals.append(r)
+            monitor.record(cycle, r / r0)
+            if progress is not None:
+                progress(cycle, r, factors[-1])
+            converged = r <= tol * r0
+        report = monitor.finish(cycle, converged)
+        method = "FMG + V(%d,%d)" if schedule == "fmg" else "V(%d,%d)"
+        return MultigridResult(**vars(report), u=self.u, residuals=residuals,
+                               reduction_factors=factors, levels=len(self.levels),
+                               method=method % (self.pre_smooth, self.post_smooth))
+
+
+if __name__ == "__main__":
+    for N in (65, 257, 1000, 1025):
+        for schedule in SCHEDULES:
+            solver = MultigridSolver(N, BoundaryConditions(top=100.0), f=1.0)
+            result = solver.solve(tol=1e-8, schedule=schedule)
+            factors = ", ".join(f"{q:.3f}" for q in result.reduction_factors[:5])
+            print(f"N={N:5d} {result.method:>14s}: уровней {result.levels}, циклов {result.iterations}, "
+                  f"время {result.wall_time:.2f} с, уменьшение невязки за цикл: {factors} ...")
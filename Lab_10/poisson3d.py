@@ -0,0 +1,299 @@
+"""
+Трехмерная задача Дирихле для уравнения Пуассона на кубической сетке
+N x N x N с семиточечным шаблоном:
+
+    6 u[i, j, k] - (сумма шести соседей) = h^2 f[i, j, k].
+
+Оси массива - (z, y, x). Используются те же решатели, что и в двумерном
+случае: PoissonSolver3D наследует цикл run(), контрольные точки и эталонное
+решение (DST) от PoissonSolver, MultigridSolver3D - V-цикл и FMG от
+MultigridSolver; здесь заменены только ядра.
+
+Память: все методы обновляют единственную сетку на месте. Якоби идет
+слоями по оси z: новые значения слоя считаются в буфер, а старые значения
+предыдущего слоя (они уже перезаписаны, но нужны соседу) хранятся в одной
+плоскости. Красно-черные методы обновляют подрешетки по частям. Буфер -
+порядка slab плоскостей N x N вместо второй полной копии сетки.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse as sp
+
+from poisson_solver import PoissonSolver
+from multigrid import MultigridSolver
+
+# Подрешетки шахматной раскраски: первый узел (i0, j0, k0), шаг 2 по всем
+# осям. Красные: i + j + k четно, черные: нечетно.
+RED_3D = ((1, 1, 2), (1, 2, 1), (2, 1, 1), (2, 2, 2))
+BLACK_3D = ((1, 1, 1), (1, 2, 2), (2, 1, 2), (2, 2, 1))
+
+SLAB = 16  # Плоскостей в буфере слоя по умолчанию
+
+
+@dataclass
+class BoundaryConditions3D:
+    """
+    Граничные условия Дирихле на шести гранях: число или массив N x N.
+    top/bottom - u[0]/u[-1] (ось z), front/back - u[:, 0]/u[:, -1] (ось y),
+    left/right - u[:, :, 0]/u[:, :, -1] (ось x). Грани задаются в порядке
+    left, right, front, back, bottom, top: на ребрах остаются значения
+    верхней/нижней грани, как в двумерном BoundaryConditions.
+    """
+    top: object = 100.0
+    bottom: object = 0.0
+    front: object = 0.0
+    back: object = 0.0
+    left: object = 0.0
+    right: object = 0.0
+
+    def apply(self, u):
+        """Записывает граничные значения в массив u (на месте) и возвращает его."""
+        u[:, :, 0] = self.left
+        u[:, :, -1] = self.right
+        u[:, 0, :] = self.front
+        u[:, -1, :] = self.back
+        u[-1] = self.bottom
+        u[0] = self.top
+        return u
+
+
+def slab_buffers(N, slab=SLAB):
+    """Буферы для jacobi_sweep_3d и red_black_sweep_3d."""
+    n, m, q = N - 2, (N - 1) // 2, max(1, min(slab, N - 2))
+    return {"new": np.empty((q, n, n)), "diff": np.empty((q, n, n)),
+            "prev": np.empty((n, n)), "rb": np.empty((q, m, m))}
+
+
+def jacobi_sweep_3d(u, h2f=None, buffers=None, compute_diff=True):
+    """
+    Шаг Якоби на месте в u слоями по оси z.
+
+    Слою [a, b) нужны старые слои a - 1 .. b: слой a - 1 уже перезаписан,
+    его старые значения лежат в buffers["prev"], остальные еще не тронуты.
+    Возвращает max |u^(k+1) - u^(k)| или None.
+    """
+    N = u.shape[0]
+    if buffers is None:
+        buffers = slab_buffers(N)
+    q = buffers["new"].shape[0]
+    prev = buffers["prev"]
+    prev[...] = u[0, 1:-1, 1:-1]
+    max_diff = 0.0
+    for a in range(1, N - 1, q):
+        b = min(a + q, N - 1)
+        t = buffers["new"][:b - a]
+        np.add(prev, u[a + 1, 1:-1, 1:-1], out=t[0])
+        if b - a > 1:
+            np.add(u[a:b - 1, 1:-1, 1:-1], u[a + 2:b + 1, 1:-1, 1:-1], out=t[1:])
+        t += u[a:b, 2:, 1:-1]
+        t += u[a:b, :-2, 1:-1]
+        t += u[a:b, 1:-1, 2:]
+        t += u[a:b, 1:-1, :-2]
+        if h2f is not None:
+            t += h2f[a - 1:b - 1]
+        t *= 1.0 / 6.0
+        old = u[a:b, 1:-1, 1:-1]
+        prev[...] = old[-1]
+        if compute_diff:
+            d = buffers["diff"][:b - a]
+            np.subtract(t, old, out=d)
+            max_diff = max(max_diff, float(np.abs(d, out=d).max()))
+        old[...] = t
+    return max_diff if compute_diff else None
+
+
+def _sub3(u, i0, j0, k0, p0, p1, di=0, dj=0, dk=0):
+    """Плоскости p0..p1-1 подрешетки (i0, j0, k0) внутренней области, сдвинутые на (di, dj, dk)."""
+    N = u.shape[1]
+    return u[i0 + di + 2 * p0:i0 + di + 2 * p1:2, j0 + dj:N - 1 + dj:2, k0 + dk:N - 1 + dk:2]
+
+
+def red_black_sweep_3d(u, h2f=None, omega=1.0, buffers=None, compute_diff=True):
+    """
+    Красно-черный шаг Зейделя (omega = 1) или ПВР на месте в u; подрешетки
+    обрабатываются частями по slab плоскостей, чтобы буфер был небольшим.
+    """
+    N = u.shape[0]
+    if buffers is None:
+        buffers = slab_buffers(N)
+    buf = buffers["rb"]
+    q = buf.shape[0]
+    max_diff = 0.0
+    for color in (RED_3D, BLACK_3D):
+        for i0, j0, k0 in color:
+            planes = len(range(i0, N - 1, 2))
+            for p0 in range(0, planes, q):
+                p1 = min(p0 + q, planes)
+                target = _sub3(u, i0, j0, k0, p0, p1)
+                if target.size == 0:
+                    continue
+                gs = buf[:target.shape[0], :target.shape[1], :target.shape[2]]
+                np.add(_sub3(u, i0, j0, k0, p0, p1, -1, 0, 0),
+                       _sub3(u, i0, j0, k0, p0, p1, 1, 0, 0), out=gs)
+                gs += _sub3(u, i0, j0, k0, p0, p1, 0, -1, 0)
+                gs += _sub3(u, i0, j0, k0, p0, p1, 0, 1, 0)
+                gs += _sub3(u, i0, j0, k0, p0, p1, 0, 0, -1)
+                gs += _sub3(u, i0, j0, k0, p0, p1, 0, 0, 1)
+                if h2f is not None:
+                    gs += h2f[i0 - 1 + 2 * p0:i0 - 1 + 2 * p1:2, j0 - 1::2, k0 - 1::2]
+                gs *= 1.0 / 6.0
+                # Поправка ω (gs - u) и обновление на месте
+                gs -= target
+                if omega != 1.0:
+                    gs *= omega
+                target += gs
+                if compute_diff:
+                    max_diff = max(max_diff, float(np.abs(gs, out=gs).max()))
+    return max_diff if compute_diff else None
+
+
+class PoissonSolver3D(PoissonSolver):
+    """
+    Итерационный решатель трехмерной задачи Дирихле (Якоби, красно-черные
+    Зейдель и ПВР). Параметры - как у PoissonSolver (boundary -
+    BoundaryConditions3D, f(x, y, z)), плюс slab - число плоскостей в буфере.
+    Потоковый полосный режим (workers, fuse_steps) есть только в 2D.
+    """
+
+    ndim = 3
+    boundary_class = BoundaryConditions3D
+
+    def __init__(self, N=None, *args, slab=SLAB, **kwargs):
+        self.slab = slab
+        self._slab = None
+        super().__init__(N, *args, **kwargs)
+
+    def _init_backend(self, workers, fuse_steps, band_rows):
+        if workers > 1 or fuse_steps > 1:
+            raise ValueError("Полосный режим Якоби реализован только для двумерной сетки")
+        self._tiled = None
+
+    def _allocate(self, method):
+        # Все методы работают на месте: вторая сетка не нужна
+        if self._slab is None:
+            self._slab = slab_buffers(self.N, self.slab)
+        return False
+
+    def _jacobi(self, compute_diff):
+        if self.keep_previous:
+            np.copyto(self.u_prev, self.u)
+        return jacobi_sweep_3d(self.u, self.h2f, self._slab, compute_diff)
+
+    def _red_black(self, compute_diff):
+        return red_black_sweep_3d(self.u, self.h2f, self.omega, self._slab, compute_diff)
+
+
+# --- Ядра многосеточного метода ---
+
+def residual_3d(u, b, out):
+    """Масштабированная невязка r = b + (сумма соседей - 6 u) во внутренних узлах."""
+    np.multiply(u[1:-1, 1:-1, 1:-1], -6.0, out=out)
+    out += u[2:, 1:-1, 1:-1]
+    out += u[:-2, 1:-1, 1:-1]
+    out += u[1:-1, 2:, 1:-1]
+    out += u[1:-1, :-2, 1:-1]
+    out += u[1:-1, 1:-1, 2:]
+    out += u[1:-1, 1:-1, :-2]
+    out += b
+    return out
+
+
+def _weight_121(r, axis):
+    """Шаблон [1 2 1] / 4 вдоль оси axis с шагом 2 (по внутренним узлам)."""
+    def take(start, stop):
+        index = [slice(None)] * r.ndim
+        index[axis] = slice(start, stop, 2)
+        return r[tuple(index)]
+    t = take(0, -2) + take(2, None)
+    t += take(1, -1)
+    t += take(1, -1)
+    t *= 0.25
+    return t
+
+
+def restrict_3d(r, out):
+    """Полное взвешивание (2 n + 1)^3 -> n^3: шаблон [1 2 1] / 4 по каждой оси."""
+    out[...] = _weight_121(_weight_121(_weight_121(r, 0), 1), 2)
+    return out
+
+
+def _interpolate(e, axis):
+    """Линейная интерполяция вдоль оси axis: n узлов -> 2 n - 1."""
+    shape = list(e.shape)
+    shape[axis] = 2 * shape[axis] - 1
+    out = np.empty(shape)
+    index = [slice(None)] * e.ndim
+    index[axis] = slice(None, None, 2)
+    out[tuple(index)] = e
+    index[axis] = slice(1, None, 2)
+    lo = [slice(None)] * e.ndim
+    hi = [slice(None)] * e.ndim
+    lo[axis], hi[axis] = slice(None, -1), slice(1, None)
+    np.add(e[tuple(lo)], e[tuple(hi)], out=out[tuple(index)])
+    out[tuple(index)] *= 0.5
+    return out
+
+
+def prolong_add_3d(e, u):
+    """Трилинейная интерполяция поправки e (n^3, нулевая граница) с прибавлением к u."""
+    u += _interpolate(_interpolate(_interpolate(e, 0), 1), 2)
+    return u
+
+
+def laplacian_matrix_3d(n):
+    """Матрица семиточечного оператора (6 u - сумма соседей) для n^3 внутренних узлов."""
+    T = sp.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(n, n))
+    I = sp.identity(n)
+    return (sp.kron(sp.kron(T, I), I) + sp.kron(sp.kron(I, T), I)
+            + sp.kron(sp.kron(I, I), T)).tocsc()
+
+
+class MultigridSolver3D(MultigridSolver):
+    """
+    Многосеточный решатель трехмерной задачи Дирихле: V-цикл и FMG
+    MultigridSolver с трехмерными ядрами. Параметры - как у MultigridSolver,
+    плюс slab (буфер сглаживателя).
+    """
+
+    ndim = 3
+    boundary_class = BoundaryConditions3D
+
+    def __init__(self, N=None, boundary=None, f=None, h=None, u0=None,
+                 pre_smooth=2, post_smooth=2, omega=1.0, coarsest=9, slab=SLAB):
+        self.slab = slab
+        super().__init__(N, boundary, f, h, u0, pre_smooth, post_smooth, omega, coarsest)
+
+    def _smoother_buffers(self, N):
+        return slab_buffers(N, self.slab)
+
+    def _smooth(self, lev, steps):
+        for _ in range(steps):
+            red_black_sweep_3d(lev.u, lev.b, self.omega, lev.buffers, compute_diff=False)
+
+    def _residual(self, lev):
+        return residual_3d(lev.u, lev.b, lev.r)
+
+    def _restrict(self, l, r, out):
+        return restrict_3d(r, out)
+
+    def _prolong_add(self, e, u):
+        return prolong_add_3d(e, u)
+
+    def _laplacian(self, n):
+        return laplacian_matrix_3d(n)
+
+
+if __name__ == "__main__":
+    N = 33
+    for method in ("jacobi", "sor"):
+        solver = PoissonSolver3D(N, f=1.0, tol=1e-6, method=method, check_every=10)
+        result = solver.run()
+        solver.close()
+        print(f"{result.method}: итераций {result.iterations}, время {result.wall_time:.2f} с, "
+              f"ошибка {solver.error():.2e}")
+    mg = MultigridSolver3D(129, f=1.0)
+    result = mg.solve(tol=1e-8, schedule="fmg")
+    print(f"N=129^3 {result.method}: циклов {result.iterations}, время {result.wall_time:.2f} с, "
+          f"уменьшение невязки: {', '.join(f'{q:.3f}' for q in result.reduction_factors)}")
@@ -1,103 +1,215 @@
+import time
 import numpy as np
 import tkinter as tk
 from tkinter import messagebox
 
+import _paths  # корень репозитория в sys.path (для utils)
+from utils.convergence import ConvergenceMonitor
+from poisson_solver import BoundaryConditions, PoissonSolver, METHODS
+
+
+def _colormap(n=256):
+    """Палитра 'синий - голубой - желтый - красный' (n x 3, uint8)."""
+    anchors = np.array([[0.0, 0.0, 0.5], [0.0, 0.0, 1.0], [0.0, 1.0, 1.0],
+                        [1.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.5, 0.0, 0.0]])
+    t = np.linspace(0.0, 1.0, n)
+    pos = np.linspace(0.0, 1.0, len(anchors))
+    rgb = np.column_stack([np.interp(t, pos, anchors[:, c]) for c in range(3)])
+    return (rgb * 255).round().astype(np.uint8)
+
+
+COLORMAP = _colormap()
+
+
+def heatmap_ppm(u, vmin, vmax, size):
+    """
+    Изображение PPM (P6) сетки u в палитре COLORMAP со стороной около size
+    пикселей: большие сетки прореживаются, маленькие увеличиваются
+    повторением узлов.
+    """
+    stride = max(1, -(-u.shape[0] // size))
+    v = u[::stride, ::stride]
+    scale = max(1, size // v.shape[0])
+    idx = np.clip((v - vmin) * (255.0 / (vmax - vmin)), 0, 255).astype(np.uint8)
+    rgb = COLORMAP[idx]
+    if scale > 1:
+        rgb = rgb.repeat(scale, axis=0).repeat(scale, axis=1)
+    return b"P6 %d %d 255\n" % (rgb.shape[1], rgb.shape[0]) + rgb.tobytes()
+
+
 class PoissonSolverGUI:
     """
     Графический интерфейс для численного решения задачи Дирихле
-    для уравнения Пуассона методом Якоби.
+    для уравнения Пуассона методом Якоби, красно-черным методом Зейделя
+    или красно-черным ПВР.
+
+    Вычисления выполняет PoissonSolver (poisson_solver.py), окно только
+    показывает его состояние и передает команды. Сетки можно показывать
+    таблицей чисел (небольшие N) или тепловой картой; при пакетном счете
+    ("k шагов", "до ε") окно перерисовывается не чаще MAX_FPS раз в секунду.
     """
-    
+
     # --- Параметры по умолчанию ---
     N = 10  # Размер сетки N x N
     DEFAULT_EPSILON = 0.0001
-    
-    def __init__(self, master):
+    DEFAULT_K = 100  # Шагов для кнопки "Выполнить k шагов"
+    HISTORY_SIZE = 1000  # Сколько последних max_diff хранить
+    METHOD_LABELS = {"jacobi": "Якоби", "gauss_seidel": "Зейдель (красно-черный)",
+                     "sor": "ПВР (красно-черный, ω авто)"}
+    DISPLAY_LABELS = {"table": "Таблица", "heatmap": "Тепловая карта"}
+    LABEL_MAX_N = 20     # Таблица Label'ов - только для небольших сеток
+    HEATMAP_SIZE = 400   # Сторона тепловой карты, пикселей
+    MAX_FPS = 20         # Наибольшая частота перерисовки
+
+    def __init__(self, master, callback=None):
         self.master = master
-        master.title("Метод Якоби для Уравнения Пуассона (h1=h2)")
-        
-        # Инициализация матриц и состояния
-        self.u_old, self.u_new = self._initialize_grid(self.N)
-        self.iteration = 0
-        
+        master.title("Итерационные методы для Уравнения Пуассона (h1=h2)")
+
+        # Инициализация сетки и решателя (u_prev нужен для показа u_old)
+        self.solver = PoissonSolver(u0=self._initialize_grid(self.N), keep_previous=True)
+        self._set_color_range()
+
+        # Наблюдение за сходимостью: callback(iteration, max_diff, elapsed)
+        self.monitor = ConvergenceMonitor(callback=callback, history_size=self.HISTORY_SIZE)
+        self.monitor.start()
+
         # Переменные для отслеживания GUI
         self.max_diff_var = tk.StringVar(value="Max Diff: N/A")
         self.iteration_var = tk.StringVar(value=f"Итерация: {self.iteration}")
         self.epsilon_entry = None
+        self.n_entry = None
+        self.k_entry = None
+        self.method_var = tk.StringVar(value=self.METHOD_LABELS[self.solver.method])
+        self.display_var = tk.StringVar(value=self.DISPLAY_LABELS["table"])
         self.matrix_labels_old = []
         self.matrix_labels_new = []
+        self.frames = []
+        self.heatmap_labels = []
+        self.heatmap_images = []
+
+        # Пакетный счет и ограничение частоты перерисовки
+        self._run_job = None       # id запланированного пакета (after)
+        self._steps_left = None    # None - считать до ε
+        self._redraw_job = None
+        self._last_draw = 0.0
 
         # --- Создание элементов GUI ---
         self._create_widgets(master)
         self._update_display()
 
     def _initialize_grid(self, N):
-        """Создает и инициализирует сетку N x N с граничными условиями."""
-        
-        # u_old - начальная матрица/значения предыдущего шага
-        u_old = np.zeros((N, N), dtype=float)
-        # u_new - матрица для записи новых значений на текущем шаге
-        u_new = np.zeros((N, N), dtype=float)
-        
-        # Задаем Граничные Условия (Boundary Conditions)
-        # Верхняя граница (строка 0) = 100.0
-        u_old[0, :] = 100.0
-        u_new[0, :] = 100.0
-        
-        # Остальные границы (Нижняя, Левая, Правая) = 0.0
-        u_old[-1, :] = 0.0
-        u_new[-1, :] = 0.0
-        u_old[:, 0] = 0.0
-        u_new[:, 0] = 0.0
-        u_old[:, -1] = 0.0
-        u_new[:, -1] = 0.0
-        
-        # Корректировка углов (чтобы не было перезаписи, хотя это не критично)
-        u_old[0, 0] = 100.0  # Верхний левый
-        u_old[0, -1] = 100.0 # Верхний правый
-        
-        # Заполняем u_new начальным приближением (копируем u_old), 
-        # чтобы начать итерации
-        u_new = u_old.copy()
-        
-        return u_old, u_new
+        """Создает сетку N x N с граничными условиями (начальное приближение)."""
+
+        # Верхняя граница (строка 0) = 100.0, остальные (нижняя, левая,
+        # правая) = 0.0; в углах остается значение верхней границы
+        return BoundaryConditions(top=100.0, bottom=0.0, left=0.0, right=0.0).apply(
+            np.zeros((N, N), dtype=float))
+
+    def _set_color_range(self):
+        """Диапазон палитры - по начальной сетке (граничным значениям)."""
+        vmin, vmax = float(self.u_new.min()), float(self.u_new.max())
+        self._vrange = (vmin, vmax if vmax > vmin else vmin + 1.0)
+
+    # Предыдущее и текущее приближения хранит решатель
+    @property
+    def u_old(self):
+        return self.solver.u_prev
+
+    @property
+    def u_new(self):
+        return self.solver.u
+
+    @property
+    def iteration(self):
+        return self.solver.iteration
+
+    @property
+    def display_mode(self):
+        label = self.display_var.get()
+        return next(m for m in self.DISPLAY_LABELS if self.DISPLAY_LABELS[m] == label)
 
     def _create_widgets(self, master):
         """Создает все элементы интерфейса."""
-        
+
         # --- 1. Панель управления ---
         control_frame = tk.Frame(master)
         control_frame.grid(row=0, column=0, columnspan=2, padx=10, pady=10)
-        
+
         # Поле для Epsilon
         tk.Label(control_frame, text="Эпсилон (ε):").pack(side=tk.LEFT, padx=5)
         self.epsilon_entry = tk.Entry(control_frame, width=10)
         self.epsilon_entry.insert(0, str(self.DEFAULT_EPSILON))
         self.epsilon_entry.pack(side=tk.LEFT, padx=5)
-        
+
+        # Выбор метода
+        tk.Label(control_frame, text="Метод:").pack(side=tk.LEFT, padx=5)
+        tk.OptionMenu(control_frame, self.method_var, *self.METHOD_LABELS.values(),
+                      command=self._change_method).pack(side=tk.LEFT, padx=5)
+
         # Кнопка для шага
         step_button = tk.Button(control_frame, text="Сделать 1 Шаг", command=self._apply_step)
         step_button.pack(side=tk.LEFT, padx=15)
-        
+
         # Кнопка для сброса и изменения весов
         reset_button = tk.Button(control_frame, text="Сброс/Изменить BC", command=self._reset_grid)
         reset_button.pack(side=tk.LEFT, padx=15)
-        
+
         # Статус итерации
         tk.Label(control_frame, textvariable=self.iteration_var).pack(side=tk.LEFT, padx=15)
         tk.Label(control_frame, textvariable=self.max_diff_var).pack(side=tk.LEFT, padx=15)
 
-        # --- 2. Две Матрицы ---
-        
+        # --- 2. Пакетный счет и вид отображения ---
+        run_frame = tk.Frame(master)
+        run_frame.grid(row=1, column=0, columnspan=2, padx=10)
+
+        tk.Label(run_frame, text="k:").pack(side=tk.LEFT, padx=5)
+        self.k_entry = tk.Entry(run_frame, width=8)
+        self.k_entry.insert(0, str(self.DEFAULT_K))
+        self.k_entry.pack(side=tk.LEFT, padx=5)
+        tk.Button(run_frame, text="Выполнить k шагов", command=self._run_k_steps).pack(side=tk.LEFT, padx=5)
+        tk.Button(run_frame, text="Считать до ε", command=self._run_to_epsilon).pack(side=tk.LEFT, padx=5)
+        tk.Button(run_frame, text="Стоп", command=self._stop_run).pack(side=tk.LEFT, padx=5)
+
+        # Размер сетки применяется при сбросе
+        tk.Label(run_frame, text="N (при сбросе):").pack(side=tk.LEFT, padx=5)
+        self.n_entry = tk.Entry(run_frame, width=6)
+        self.n_entry.insert(0, str(self.N))
+        self.n_entry.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(run_frame, text="Вид:").pack(side=tk.LEFT, padx=5)
+        tk.OptionMenu(run_frame, self.display_var, *self.DISPLAY_LABELS.values(),
+                      command=self._change_display).pack(side=tk.LEFT, padx=5)
+
+        # --- 3. Две Матрицы ---
+        self._build_display()
+
+    def _build_display(self):
+        """Создает (заново) области отображения u_old и u_new."""
+        for frame in self.frames:
+            frame.destroy()
+        self.matrix_labels_old, self.matrix_labels_new = [], []
+        self.heatmap_labels, self.heatmap_images = [], []
+        if self.N > self.LABEL_MAX_N:
+            self.display_var.set(self.DISPLAY_LABELS["heatmap"])
+
         # Матрица 1: u_old (Изначальная/Предыдущий шаг)
-        frame_old = tk.LabelFrame(master, text="Матрица 'u_old' (Предыдущий шаг / Исходная)", padx=5, pady=5)
-        frame_old.grid(row=1, column=0, padx=10, pady=10)
-        self._draw_matrix_labels(frame_old, self.matrix_labels_old)
+        frame_old = tk.LabelFrame(self.master, text="Матрица 'u_old' (Предыдущий шаг / Исходная)", padx=5, pady=5)
+        frame_old.grid(row=2, column=0, padx=10, pady=10)
 
         # Матрица 2: u_new (Текущий шаг)
-        frame_new = tk.LabelFrame(master, text="Матрица 'u_new' (Текущий шаг / Новые значения)", padx=5, pady=5)
-        frame_new.grid(row=1, column=1, padx=10, pady=10)
-        self._draw_matrix_labels(frame_new, self.matrix_labels_new)
+        frame_new = tk.LabelFrame(self.master, text="Матрица 'u_new' (Текущий шаг / Новые значения)", padx=5, pady=5)
+        frame_new.grid(row=2, column=1, padx=10, pady=10)
+        self.frames = [frame_old, frame_new]
+
+        if self.display_mode == "table":
+            self._draw_matrix_labels(frame_old, self.matrix_labels_old)
+            self._draw_matrix_labels(frame_new, self.matrix_labels_new)
+        else:
+            for frame in self.frames:
+                label = tk.Label(frame)
+                label.pack()
+                self.heatmap_labels.append(label)
+                self.heatmap_images.append(None)
 
     def _draw_matrix_labels(self, frame, label_list):
         """Создает пустые Label для отображения данных матрицы."""
@@ -110,105 +222,192 @@ class PoissonSolverGUI:
             label_list.append(row_labels)
 
     def _update_display(self):
-        """Обновляет текст в Label'ах на основе значений массивов u_old и u_new."""
-        
-        # Обновление u_old
-        for i in range(self.N):
-            for j in range(self.N):
-                val = self.u_old[i, j]
-                self.matrix_labels_old[i][j].config(text=f"{val:.2f}")
+        """Обновляет отображение массивов u_old и u_new и статус."""
+        self._last_draw = time.perf_counter()
+        if self._redraw_job is not None:
+            self.master.after_cancel(self._redraw_job)
+            self._redraw_job = None
 
-        # Обновление u_new
-        for i in range(self.N):
-            for j in range(self.N):
-                val = self.u_new[i, j]
-                self.matrix_labels_new[i][j].config(text=f"{val:.2f}")
+        if self.display_mode == "table":
+            # Обновление u_old
+            for i in range(self.N):
+                for j in range(self.N):
+                    val = self.u_old[i, j]
+                    self.matrix_labels_old[i][j].config(text=f"{val:.2f}")
+
+            # Обновление u_new
+            for i in range(self.N):
+                for j in range(self.N):
+                    val = self.u_new[i, j]
+                    self.matrix_labels_new[i][j].config(text=f"{val:.2f}")
+        else:
+            # Тепловые карты: одно изображение на сетку. Ссылку на PhotoImage
+            # нужно хранить, иначе Tk удалит картинку
+            for k, u in enumerate((self.u_old, self.u_new)):
+                image = tk.PhotoImage(data=heatmap_ppm(u, *self._vrange, self.HEATMAP_SIZE), format="PPM")
+                self.heatmap_labels[k].config(image=image)
+                self.heatmap_images[k] = image
 
         # Обновление номера итерации
         self.iteration_var.set(f"Итерация: {self.iteration}")
 
+    def _request_redraw(self):
+        """Перерисовка не чаще MAX_FPS раз в секунду: иначе откладывается."""
+        delay = 1.0 / self.MAX_FPS - (time.perf_counter() - self._last_draw)
+        if delay <= 0:
+            self._update_display()
+        elif self._redraw_job is None:
+            self._redraw_job = self.master.after(int(delay * 1000) + 1, self._update_display)
+
+    def _change_display(self, label=None):
+        """Переключает вид отображения (таблица - только при N <= LABEL_MAX_N)."""
+        self._build_display()
+        self._update_display()
+
     def _jacobi_step(self):
-        """Выполняет один шаг итерации Якоби и возвращает max_diff."""
-        
-        # В методе Якоби мы ВСЕГДА используем старые (u_old) значения для расчета 
-        # всех новых (u_new) значений.
-        
-        max_diff = 0.0
-        
-        # Итерируем только по внутренним точкам (от 1 до N-2)
-        # Граничные точки (0 и N-1) не изменяются.
-        for i in range(1, self.N - 1):
-            for j in range(1, self.N - 1):
-                
-                # --- Формула Якоби для h1=h2=h и f=0 ---
-                # u_new[i,j] = 1/4 * (Сумма четырех соседей)
-                
-                sum_neighbors = (self.u_old[i+1, j] + # снизу
-                                 self.u_old[i-1, j] + # сверху
-                                 self.u_old[i, j+1] + # справа
-                                 self.u_old[i, j-1])  # слева
-                
-                new_val = sum_neighbors / 4.0
-                
-                # Сохраняем новое значение в u_new
-                self.u_new[i, j] = new_val
-                
-                # Рассчитываем и обновляем максимальную разницу
-                diff = abs(new_val - self.u_old[i, j])
-                if diff > max_diff:
-                    max_diff = diff
-                    
-        return max_diff
+        """Выполняет один шаг выбранного метода и возвращает max_diff."""
+        return self.solver.step()
 
-    def _apply_step(self):
-        """Обрабатывает нажатие кнопки "Сделать 1 Шаг"."""
-        
+    def _selected_method(self):
+        label = self.method_var.get()
+        return next(m for m in METHODS if self.METHOD_LABELS[m] == label)
+
+    def _change_method(self, label=None):
+        """Переключает метод; итерации продолжаются с текущего приближения."""
+        self.solver.set_method(self._selected_method())
+
+    def _read_epsilon(self):
         try:
-            epsilon = float(self.epsilon_entry.get())
+            return float(self.epsilon_entry.get())
         except ValueError:
             messagebox.showerror("Ошибка", "Неверное значение Epsilon.")
+            return None
+
+    def _check_convergence(self, max_diff, epsilon):
+        """Обновляет статус после шага; True, если сходимость достигнута."""
+        self.max_diff_var.set(f"Max Diff: {max_diff:.6f}")
+        if max_diff >= epsilon:
+            return False
+        report = self.monitor.finish(self.iteration, True)
+        self.max_diff_var.set(f"Сходимость (ε={epsilon:.4f}) достигнута!")
+        messagebox.showinfo("Готово", f"Сходимость достигнута на итерации {self.iteration}!\n"
+                                      f"Скорость сходимости: {report.convergence_rate:.4f} за итерацию")
+        return True
+
+    def _apply_step(self):
+        """Обрабатывает нажатие кнопки "Сделать 1 Шаг"."""
+
+        epsilon = self._read_epsilon()
+        if epsilon is None:
             return
 
         if self.max_diff_var.get().startswith("Сходимость"):
             messagebox.showinfo("Готово", "Сходимость уже достигнута.")
             return
-        
-        # 1. Выполняем шаг итерации
+
+        # 1-2. Выполняем шаг итерации (решатель сам меняет массивы
+        # местами: текущее приближение становится "старым")
+        self.solver.tol = epsilon
         max_diff = self._jacobi_step()
-        self.iteration += 1
-        
-        # 2. Обновляем старую матрицу (для следующего шага)
-        # Это критически важный шаг для метода Якоби
-        self.u_old = self.u_new.copy() 
-        
-        # 3. Обновляем статус
-        self.max_diff_var.set(f"Max Diff: {max_diff:.6f}")
-        
-        # 4. Проверяем условие сходимости
-        if max_diff < epsilon:
-            self.max_diff_var.set(f"Сходимость (ε={epsilon:.4f}) достигнута!")
-            messagebox.showinfo("Готово", f"Сходимость достигнута на итерации {self.iteration}!")
-        
+        self.monitor.record(self.iteration, max_diff)
+
+        # 3-4. Обновляем статус и проверяем условие сходимости
+        self._check_convergence(max_diff, epsilon)
+
         # 5. Обновляем отображение GUI
         self._update_display()
-        
+
+    def _run_k_steps(self):
+        """Обрабатывает кнопку "Выполнить k шагов"."""
+        try:
+            k = int(self.k_entry.get())
+        except ValueError:
+            messagebox.showerror("Ошибка", "Неверное значение k.")
+            return
+        self._start_run(max(0, k))
+
+    def _run_to_epsilon(self):
+        """Обрабатывает кнопку "Считать до ε"."""
+        self._start_run(None)
+
+    def _start_run(self, steps):
+        if self.max_diff_var.get().startswith("Сходимость"):
+            messagebox.showinfo("Готово", "Сходимость уже достигнута.")
+            return
+        epsilon = self._read_epsilon()
+        if epsilon is None:
+            return
+        self._stop_run()
+        self.solver.tol = epsilon
+        self._steps_left = steps
+        self._run_batch()
+
+    def _run_batch(self):
+        """
+        Пакет шагов длительностью не больше одного кадра (1 / MAX_FPS с),
+        затем перерисовка и планирование следующего пакета через after -
+        окно остается отзывчивым.
+        """
+        self._run_job = None
+        budget = 1.0 / self.MAX_FPS
+        t_start = time.perf_counter()
+        converged = False
+        while self._steps_left is None or self._steps_left > 0:
+            max_diff = self._jacobi_step()
+            self.monitor.record(self.iteration, max_diff)
+            if self._steps_left is not None:
+                self._steps_left -= 1
+            if max_diff < self.solver.tol:
+                converged = True
+                break
+            if time.perf_counter() - t_start >= budget:
+                break
+        else:
+            max_diff = self.solver.max_diff
+
+        if np.isfinite(max_diff):
+            converged = self._check_convergence(max_diff, self.solver.tol)
+        if converged or self._steps_left == 0:
+            self._update_display()
+        else:
+            self._request_redraw()
+            self._run_job = self.master.after(1, self._run_batch)
+
+    def _stop_run(self):
+        if self._run_job is not None:
+            self.master.after_cancel(self._run_job)
+            self._run_job = None
+
     def _reset_grid(self):
-        """Сбрасывает сетку к исходным граничным условиям."""
-        
+        """Сбрасывает сетку к исходным граничным условиям (и новому N)."""
+
+        try:
+            N = int(self.n_entry.get())
+        except ValueError:
+            N = 0
+        if N < 3:
+            messagebox.showerror("Ошибка", "N должно быть целым числом не меньше 3.")
+            return
+        self._stop_run()
+
         # Переопределим граничные условия для наглядности (например, сделаем левую границу горячей)
-        self.u_old, self.u_new = self._initialize_grid(self.N)
-        
+        u0 = self._initialize_grid(N)
+
         # Новые условия: Верхняя 100, Левая 50, Остальные 0
-        self.u_old[0, :] = 100.0
-        self.u_new[0, :] = 100.0
-        self.u_old[:, 0] = 50.0
-        self.u_new[:, 0] = 50.0
-        
-        # Сброс счетчиков
-        self.iteration = 0
+        u0[0, :] = 100.0
+        u0[:, 0] = 50.0
+
+        # Новый решатель (счетчик итераций начинается с нуля)
+        self.solver.close()
+        self.solver = PoissonSolver(u0=u0, method=self._selected_method(), keep_previous=True)
+        self._set_color_range()
+        self.monitor.start()
         self.max_diff_var.set("Max Diff: N/A")
-        
-        # Обновление отображения
+
+        # Обновление отображения (при новом N - заново создаем его элементы)
+        if N != self.N:
+            self.N = N
+            self._build_display()
         self._update_display()
         messagebox.showinfo("Сброс", "Сетка сброшена. Новые BC: Верх=100, Лево=50, Остальное=0.")
 
@@ -216,4 +415,4 @@ class PoissonSolverGUI:
 if __name__ == '__main__':
     root = tk.Tk()
     app = PoissonSolverGUI(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
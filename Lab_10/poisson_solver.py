@@ -0,0 +1,433 @@
+"""
+Решатель задачи Дирихле для уравнения Пуассона без графического интерфейса.
+
+    -Δu = f  в квадрате,  u = g  на границе,
+
+сетка N x N (включая граничные узлы) с шагом h1 = h2 = h. Узел u[0, :] -
+верхняя граница, u[-1, :] - нижняя, u[:, 0] - левая, u[:, -1] - правая
+(как в PoissonSolverGUI). Итерация Якоби:
+
+    u_new[i, j] = (u[i+1, j] + u[i-1, j] + u[i, j+1] + u[i, j-1] + h^2 f[i, j]) / 4.
+
+Методы Зейделя и ПВР (SOR) используют красно-черное упорядочивание: узлы
+с четной суммой i + j ("красные") зависят только от "черных" и наоборот,
+поэтому каждый цвет обновляется целиком срезами через один узел, на месте,
+в одной сетке. При оптимальном ω = 2 / (1 + sin(π h)) ПВР сходится за O(N)
+итераций вместо O(N^2) у Якоби.
+
+Точное решение разностной задачи без итераций дает solve_direct()
+(синусное преобразование, fast_poisson.dst_solve); reference() и error()
+позволяют сравнивать с ним итерационные приближения.
+
+Для больших сеток шаг Якоби можно выполнять в пуле потоков по полосам строк
+с временной блокировкой (workers, fuse_steps; см. tiled_stencil.py).
+
+Долгие расчёты могут хранить сетки в файлах (np.memmap, storage_dir) и
+периодически записывать контрольные точки; PoissonSolver.resume продолжает
+расчёт с последней из них (см. checkpoint.py).
+
+Модуль не импортирует tkinter, поэтому годится для пакетных расчётов на
+больших сетках; PoissonSolverGUI использует его как движок.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+import _paths  # корень репозитория в sys.path (для utils)
+from utils.convergence import ConvergenceMonitor, ConvergenceReport
+from fast_poisson import dst_solve
+from checkpoint import allocate_grid, copy_rows, load_checkpoint, save_checkpoint
+
+
+@dataclass
+class BoundaryConditions:
+    """
+    Граничные условия Дирихле: число или массив длины N для каждой стороны.
+    Стороны задаются в порядке left, right, bottom, top, поэтому в углах
+    остаются значения верхней/нижней границы.
+    """
+    top: object = 100.0
+    bottom: object = 0.0
+    left: object = 0.0
+    right: object = 0.0
+
+    def apply(self, u):
+        """Записывает граничные значения в массив u (на месте) и возвращает его."""
+        u[:, 0] = self.left
+        u[:, -1] = self.right
+        u[-1, :] = self.bottom
+        u[0, :] = self.top
+        return u
+
+
+@dataclass
+class PoissonResult(ConvergenceReport):
+    """Итог расчёта: сетка и статистика (last_value - последний max_diff)."""
+    u: np.ndarray = None
+    method: str = ""
+
+
+def jacobi_sweep(u_old, u_new, h2f=None, diff=None):
+    """
+    Один шаг Якоби: внутренние узлы u_new по u_old (границы не меняются).
+
+    h2f - массив h^2 f для внутренних узлов или None при f = 0.
+    diff - буфер формы внутренней области; если задан, возвращается
+    max |u_new - u_old|, иначе None.
+    """
+    inner = u_new[1:-1, 1:-1]
+    np.add(u_old[2:, 1:-1], u_old[:-2, 1:-1], out=inner)
+    np.add(inner, u_old[1:-1, 2:], out=inner)
+    np.add(inner, u_old[1:-1, :-2], out=inner)
+    if h2f is not None:
+        np.add(inner, h2f, out=inner)
+    np.multiply(inner, 0.25, out=inner)
+    if diff is None:
+        return None
+    np.subtract(inner, u_old[1:-1, 1:-1], out=diff)
+    np.abs(diff, out=diff)
+    return float(diff.max()) if diff.size else 0.0
+
+
+# Подрешетки шахматной раскраски внутренних узлов: (i0, j0) - первый узел,
+# шаг 2 по обеим осям. Красные: i + j четно, черные: нечетно.
+RED = ((1, 1), (2, 2))
+BLACK = ((1, 2), (2, 1))
+
+
+def _sublattice(u, i0, j0, di=0, dj=0):
+    """Узлы u[i0::2, j0::2] внутренней области, сдвинутые на (di, dj)."""
+    n, m = u.shape
+    return u[i0 + di:n - 1 + di:2, j0 + dj:m - 1 + dj:2]
+
+
+def red_black_buffers(N):
+    """Буферы для red_black_sweep: по одному на каждую подрешетку."""
+    return {(i0, j0): np.empty(_sublattice(np.empty((N, N)), i0, j0).shape)
+            for i0, j0 in RED + BLACK}
+
+
+def red_black_sweep(u, h2f=None, omega=1.0, buffers=None, compute_diff=True):
+    """
+    Один красно-черный шаг Зейделя (omega = 1) или ПВР на месте в u.
+
+    h2f - h^2 f во внутренних узлах или None; buffers - из red_black_buffers.
+    Возвращает max |u^(k+1) - u^(k)| или None при compute_diff=False.
+    """
+    if buffers is None:
+        buffers = red_black_buffers(u.shape[0])
+    max_diff = 0.0
+    for color in (RED, BLACK):
+        for i0, j0 in color:
+            target = _sublattice(u, i0, j0)
+            if target.size == 0:
+                continue
+            # Значение Зейделя по соседям другого цвета
+            gs = buffers[i0, j0]
+            np.add(_sublattice(u, i0, j0, -1, 0), _sublattice(u, i0, j0, 1, 0), out=gs)
+            np.add(gs, _sublattice(u, i0, j0, 0, -1), out=gs)
+            np.add(gs, _sublattice(u, i0, j0, 0, 1), out=gs)
+            if h2f is not None:
+                np.add(gs, h2f[i0 - 1::2, j0 - 1::2], out=gs)
+            np.multiply(gs, 0.25, out=gs)
+            # Поправка ω (gs - u) и обновление на месте
+            np.subtract(gs, target, out=gs)
+            if omega != 1.0:
+                np.multiply(gs, omega, out=gs)
+            np.add(target, gs, out=target)
+            if compute_diff:
+                max_diff = max(max_diff, float(np.abs(gs, out=gs).max()))
+    return max_diff if compute_diff else None
+
+
+def optimal_omega(N):
+    """
+    Оптимальный параметр ПВР для сетки N x N: ω = 2 / (1 + sqrt(1 - ρ^2)),
+    где ρ = cos(π / (N - 1)) - спектральный радиус метода Якоби.
+    """
+    return 2.0 / (1.0 + np.sin(np.pi / (N - 1)))
+
+
+METHODS = ("jacobi", "gauss_seidel", "sor")
+
+
+class PoissonSolver:
+    """
+    Итерационный решатель задачи Дирихле на квадратной сетке N x N.
+
+    Размерность задается атрибутом класса ndim: шаги методов и буферы -
+    методы _init_backend, _allocate, _jacobi, _red_black (трехмерный
+    вариант - PoissonSolver3D в poisson3d.py), цикл run(), контрольные
+    точки и эталонное решение общие.
+
+    Args:
+        N: число узлов по каждой стороне (включая границу); при заданном u0
+            берется из его формы.
+        boundary: BoundaryConditions; игнорируется, если задан u0.
+        f: правая часть - число, массив (N, N) или функция f(x, y) на сетке
+            (x - номер столбца * h, y - номер строки * h); None - уравнение Лапласа.
+        tol: критерий остановки max |u^(k+1) - u^(k)| < tol.
+        h: шаг сетки (по умолчанию 1 / (N - 1)).
+        u0: начальная сетка; её края задают граничные условия.
+        check_every: как часто (в итерациях) считать max_diff в run().
+        method: "jacobi", "gauss_seidel" или "sor" (красно-черные, на месте).
+        omega: параметр ПВР; "auto" - optimal_omega(N).
+        keep_previous: хранить предыдущее приближение u_prev и для методов
+            на месте (нужно для отображения в GUI; лишнее копирование сетки).
+        workers, fuse_steps, band_rows: полосный режим Якоби (TiledJacobi) -
+            число потоков, итераций за один проход полосы и строк в полосе.
+            При fuse_steps > 1 шаг step() выполняет fuse_steps итераций, а
+            u_prev - приближение в начале этого блока.
+        storage_dir: каталог для сеток в файлах (np.memmap) и контрольных
+            точек. Якоби тогда считается по полосам, и в памяти остаются
+            только буферы полос; красно-черным методам нужны буферы O(N^2),
+            как и правой части f.
+        checkpoint_every, checkpoint_seconds: в run() контрольная точка
+            пишется каждые checkpoint_every итераций и/или не реже чем раз в
+            checkpoint_seconds секунд (нужен storage_dir).
+    """
+
+    ndim = 2
+    boundary_class = BoundaryConditions
+
+    def __init__(self, N=None, boundary=None, f=None, tol=1e-4, h=None, u0=None,
+                 check_every=1, method="jacobi", omega="auto", keep_previous=False,
+                 workers=1, fuse_steps=1, band_rows=None, storage_dir=None,
+                 checkpoint_every=None, checkpoint_seconds=None):
+        if u0 is not None:
+            u0 = np.asarray(u0, dtype=float)
+            N = u0.shape[0]
+            if u0.shape != (N,) * self.ndim:
+                raise ValueError("Начальная сетка должна иметь одинаковый размер по всем осям")
+        if N is None or N < 3:
+            raise ValueError("Сетка должна содержать хотя бы один внутренний узел")
+        self.N = N
+        self.shape = (N,) * self.ndim
+        self.h = 1.0 / (N - 1) if h is None else h
+        self.tol = tol
+        self.check_every = max(1, int(check_every))
+
+        self.storage_dir = storage_dir
+        if storage_dir is not None:
+            os.makedirs(storage_dir, exist_ok=True)
+        elif checkpoint_every is not None or checkpoint_seconds is not None:
+            raise ValueError("Для контрольных точек нужен storage_dir")
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+
+        self.u = self._new_grid("u_a")  # текущее приближение
+        if u0 is None:
+            (boundary or self.boundary_class()).apply(self.u)
+        else:
+            copy_rows(u0, self.u)
+        self.u_prev = None          # предыдущее приближение
+        self.keep_previous = keep_previous
+        self.h2f = self._rhs(f)
+        self._diff = None
+        self._rb_buffers = None
+        self.iteration = 0
+        self.max_diff = np.inf
+        self._reference = None
+        self._init_backend(workers, fuse_steps, band_rows)
+        self.set_method(method, omega)
+
+    def _init_backend(self, workers, fuse_steps, band_rows):
+        """Полосный режим Якоби (потоки, временная блокировка, файлы)."""
+        self._tiled = None
+        if workers > 1 or fuse_steps > 1 or self.storage_dir is not None:
+            from tiled_stencil import TiledJacobi
+            self._tiled = TiledJacobi(self.N, workers, fuse_steps, band_rows)
+
+    def close(self):
+        """Останавливает пул потоков полосного режима (при следующем шаге создается заново)."""
+        if self._tiled is not None:
+            self._tiled.close()
+
+    def set_method(self, method, omega="auto"):
+        """Выбирает метод; можно менять между итерациями."""
+        if method not in METHODS:
+            raise ValueError(f"Неизвестный метод {method!r}, ожидается один из {METHODS}")
+        self.method = method
+        if method == "sor":
+            self.omega = optimal_omega(self.N) if omega == "auto" else float(omega)
+        else:
+            self.omega = 1.0
+        # Якоби всегда нужен второй массив; методам на месте - только по запросу
+        if self.u_prev is None and (self._allocate(method) or self.keep_previous):
+            self.u_prev = self._new_grid("u_b")
+            copy_rows(self.u, self.u_prev)
+
+    def _allocate(self, method):
+        """Буферы метода; True, если методу нужна вторая сетка u_prev."""
+        if method == "jacobi":
+            if self._diff is None and self._tiled is None:
+                self._diff = np.empty((self.N - 2, self.N - 2))
+            return True
+        if self._rb_buffers is None:
+            self._rb_buffers = red_black_buffers(self.N)
+        return False
+
+    def _new_grid(self, name):
+        """Сетка N x N в памяти или в файле storage_dir/<name>.dat."""
+        path = None if self.storage_dir is None else os.path.join(self.storage_dir, name + ".dat")
+        return allocate_grid(self.shape, path)
+
+    @property
+    def method_name(self):
+        if self.method == "jacobi":
+            return "Jacobi"
+        if self.method == "gauss_seidel":
+            return "Red-black Gauss-Seidel"
+        return f"Red-black SOR (ω={self.omega:.4f})"
+
+    def _rhs(self, f):
+        """h^2 f во внутренних узлах (или None при f = 0)."""
+        if f is None:
+            return None
+        if callable(f):
+            # Оси массива: (y, x) или (z, y, x); f получает (x, y[, z])
+            coords = np.mgrid[(slice(0, self.N),) * self.ndim] * self.h
+            f = f(*coords[::-1])
+        f = np.broadcast_to(np.asarray(f, dtype=float), self.shape)
+        if not np.any(f):
+            return None
+        return self.h ** 2 * np.ascontiguousarray(f[(slice(1, -1),) * self.ndim])
+
+    def step(self, compute_diff=True):
+        """
+        Одна итерация выбранного метода. У Якоби массивы меняются местами
+        по ссылке: после шага u - новое приближение, u_prev - предыдущее.
+        Красно-черные методы обновляют u на месте (u_prev - копия, если
+        задан keep_previous).
+        """
+        if self.method == "jacobi":
+            diff = self._jacobi(compute_diff)
+        else:
+            if self.keep_previous:
+                np.copyto(self.u_prev, self.u)
+            diff = self._red_black(compute_diff)
+        self.iteration += self.steps_per_call
+        if diff is not None:
+            self.max_diff = diff
+        return diff
+
+    def _jacobi(self, compute_diff):
+        self.u_prev, self.u = self.u, self.u_prev
+        if self._tiled is not None:
+            return self._tiled.sweep(self.u_prev, self.u, self.h2f, compute_diff)
+        return jacobi_sweep(self.u_prev, self.u, self.h2f,
+                            self._diff if compute_diff else None)
+
+    def _red_black(self, compute_diff):
+        return red_black_sweep(self.u, self.h2f, self.omega, self._rb_buffers, compute_diff)
+
+    @property
+    def steps_per_call(self):
+        """Сколько итераций выполняет один вызов step()."""
+        if self.method == "jacobi" and self._tiled is not None:
+            return self._tiled.steps
+        return 1
+
+    @property
+    def converged(self):
+        return self.max_diff < self.tol
+
+    def run(self, max_iter=1_000_000, progress=None, every=100, monitor=None):
+        """
+        Итерирует до сходимости (или max_iter итераций; при fuse_steps > 1
+        число итераций округляется вверх до кратного fuse_steps).
+
+        progress(iteration, max_diff, elapsed) вызывается каждые every
+        итераций; monitor (utils.convergence) получает каждое вычисленное
+        значение max_diff.
+        """
+        monitor = ConvergenceMonitor(history_size=0) if monitor is None else monitor
+        monitor.start()
+        t_start = t_saved = time.perf_counter()
+        start_iter = self.iteration
+        every_k, every_t = self.checkpoint_every, self.checkpoint_seconds
+        saving = every_k is not None or every_t is not None
+        while not self.converged and self.iteration - start_iter < max_iter:
+            k0, k = self.iteration, self.iteration + self.steps_per_call
+            # Проверка, если блок итераций пересек кратное check_every
+            check = k // self.check_every > k0 // self.check_every or k - start_iter >= max_iter
+            diff = self.step(compute_diff=check)
+            if diff is not None:
+                monitor.record(self.iteration, diff)
+            if progress is not None and k // every > k0 // every:
+                progress(self.iteration, self.max_diff, time.perf_counter() - t_start)
+            if ((every_k is not None and k // every_k > k0 // every_k)
+                    or (every_t is not None and time.perf_counter() - t_saved >= every_t)):
+                self.checkpoint()
+                t_saved = time.perf_counter()
+        if saving:
+            self.checkpoint()
+        report = monitor.finish(self.iteration - start_iter, self.converged)
+        return PoissonResult(**vars(report), u=self.u, method=self.method_name)
+
+    def checkpoint(self):
+        """Атомарно записывает контрольную точку в storage_dir."""
+        if self.storage_dir is None:
+            raise ValueError("Для контрольных точек нужен storage_dir")
+        return save_checkpoint(self.storage_dir, self.u, iteration=self.iteration,
+                               max_diff=float(self.max_diff), method=self.method,
+                               omega=self.omega, h=self.h, tol=self.tol)
+
+    @classmethod
+    def resume(cls, storage_dir, f=None, **kwargs):
+        """
+        Решатель, продолжающий расчёт с последней контрольной точки в
+        storage_dir. Правая часть f не сохраняется - ее нужно передать
+        снова; остальные параметры (метод, ω, h, tol) берутся из точки,
+        если не заданы в kwargs.
+        """
+        saved = load_checkpoint(storage_dir)
+        if saved is None:
+            raise FileNotFoundError(f"В {storage_dir} нет контрольной точки")
+        meta, u = saved
+        for key in ("method", "omega", "h", "tol"):
+            kwargs.setdefault(key, meta[key])
+        solver = cls(u0=u, f=f, storage_dir=storage_dir, **kwargs)
+        solver.iteration = meta["iteration"]
+        solver.max_diff = meta["max_diff"]
+        return solver
+
+    def reference(self):
+        """Точное решение разностной задачи (DST), вычисляется один раз."""
+        if self._reference is None:
+            self._reference = dst_solve(self.u, self.h2f)
+        return self._reference
+
+    def error(self):
+        """max |u - u*| - отклонение текущего приближения от точного решения."""
+        return float(np.abs(self.u - self.reference()).max())
+
+    def solve_direct(self):
+        """
+        Прямой режим: записывает в u точное решение разностной задачи
+        за O(N^d log N) без итераций.
+        """
+        monitor = ConvergenceMonitor(history_size=0)
+        monitor.start()
+        dst_solve(self.u, self.h2f, out=self.u)
+        if self.u_prev is not None:
+            np.copyto(self.u_prev, self.u)
+        self.max_diff = 0.0
+        report = monitor.finish(0, True)
+        return PoissonResult(**vars(report), u=self.u, method="DST")
+
+
+if __name__ == "__main__":
+    # Пакетный расчёт без графического интерфейса
+    for method in METHODS:
+        solver = PoissonSolver(64, BoundaryConditions(top=100.0), tol=1e-4,
+                               check_every=10, method=method)
+        result = solver.run(progress=lambda k, d, t: print(f"  k={k:6d}  max_diff={d:.2e}  t={t:.2f} с"),
+                            every=1000)
+        solver.close()
+        print(f"{result.method}: итераций {result.iterations}, сходимость: {result.converged}, "
+              f"время {result.wall_time:.2f} с ({result.time_per_iteration * 1e6:.0f} мкс/итерация), "
+              f"ошибка {solver.error():.2e}")
@@ -0,0 +1,112 @@
+"""
+Многопоточный шаг Якоби по полосам строк для больших сеток Lab_10.
+
+Внутренние строки сетки делятся на полосы; каждая полоса считается в пуле
+потоков (срезы NumPy отпускают GIL). Полоса читает только u_old (со
+строками-"ореолом" соседних полос) и пишет только свои строки u_new, поэтому
+синхронизация не нужна. Максимальная разность считается в каждой полосе и
+сводится в конце.
+
+Временная блокировка (steps > 1): полоса копирует во внутренний буфер свои
+строки и по steps строк ореола с каждой стороны и делает steps итераций
+подряд, пока окно находится в кэше. После t итераций неверны только t
+крайних строк окна (у них устаревшие соседи), поэтому строки полосы
+оказываются точными. Арифметика та же, что в jacobi_sweep, и результат
+побитово совпадает с steps однопоточными шагами.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from poisson_solver import jacobi_sweep
+
+# Желаемый размер окна полосы (два буфера), байт - порядка кэша L2
+WINDOW_BYTES = 1 << 20
+
+
+class TiledJacobi:
+    """
+    Шаг(и) Якоби по полосам строк.
+
+    Args:
+        N: размер сетки (N x N).
+        workers: число потоков; 1 - полосы по очереди в текущем потоке.
+        steps: сколько итераций выполнять за один проход по полосе.
+        band_rows: строк в полосе; по умолчанию окно занимает ~WINDOW_BYTES,
+            но не меньше 4 * steps строк (доля ореола не больше половины).
+    """
+
+    def __init__(self, N, workers=1, steps=1, band_rows=None):
+        self.N = N
+        self.workers = max(1, int(workers))
+        self.steps = max(1, int(steps))
+        if band_rows is None:
+            band_rows = max(4 * self.steps, WINDOW_BYTES // (16 * N) - 2 * self.steps)
+        band_rows = max(1, min(int(band_rows), N - 2))
+        # Не меньше полосы на поток, чтобы загрузить все ядра
+        band_rows = min(band_rows, -(-(N - 2) // self.workers))
+        self.bands = [(r, min(r + band_rows, N - 1)) for r in range(1, N - 1, band_rows)]
+        self._local = threading.local()
+        self._pool = None
+
+    def _buffers(self, rows):
+        """Буферы потока: два окна и разность (переиспользуются)."""
+        loc = self._local
+        if getattr(loc, "rows", 0) < rows:
+            loc.a = np.empty((rows, self.N))
+            loc.b = np.empty((rows, self.N))
+            loc.diff = np.empty((rows, self.N - 2))
+            loc.rows = rows
+        return loc
+
+    def _band(self, band, u_old, u_new, h2f, compute_diff):
+        r0, r1 = band
+        if self.steps == 1:
+            # Без блокировки окно не нужно: срезы u_old/u_new со строками ореола
+            loc = self._buffers(r1 - r0)
+            diff = loc.diff[:r1 - r0] if compute_diff else None
+            return jacobi_sweep(u_old[r0 - 1:r1 + 1], u_new[r0 - 1:r1 + 1],
+                                None if h2f is None else h2f[r0 - 1:r1 - 1], diff)
+
+        lo = max(0, r0 - self.steps)
+        hi = min(self.N, r1 + self.steps)
+        loc = self._buffers(hi - lo)
+        a, b = loc.a[:hi - lo], loc.b[:hi - lo]
+        a[...] = u_old[lo:hi]
+        b[0], b[-1] = a[0], a[-1]
+        b[:, 0], b[:, -1] = a[:, 0], a[:, -1]
+        rhs = None if h2f is None else h2f[lo:hi - 2]
+        for _ in range(self.steps):
+            jacobi_sweep(a, b, rhs)
+            a, b = b, a
+        # a - последнее приближение, b - предыдущее
+        u_new[r0:r1] = a[r0 - lo:r1 - lo]
+        if not compute_diff:
+            return None
+        diff = loc.diff[:r1 - r0]
+        np.subtract(a[r0 - lo:r1 - lo, 1:-1], b[r0 - lo:r1 - lo, 1:-1], out=diff)
+        np.abs(diff, out=diff)
+        return float(diff.max())
+
+    def sweep(self, u_old, u_new, h2f=None, compute_diff=True):
+        """
+        steps итераций Якоби от u_old к u_new (u_old не меняется).
+        Возвращает max |u^(k+steps) - u^(k+steps-1)| или None.
+        """
+        def run(band):
+            return self._band(band, u_old, u_new, h2f, compute_diff)
+
+        if self.workers == 1:
+            results = [run(band) for band in self.bands]
+        else:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+            results = list(self._pool.map(run, self.bands))
+        return max(results) if compute_diff else None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
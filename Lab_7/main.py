@@ -1,38 +1,67 @@
 import numpy as np
 
-a = np.array([2, 3, 1.5, 2.5, 1, 4])
-n = len(a)
-W_volume = np.prod(2 * a)
+from monte_carlo import MonteCarloIntegrator
 
-alpha = np.array([-0.11668255, -1.90093714, -2.28172284])
-beta  = np.array([3.74736003,  2.88284760,  1.59672290])
+# --- ПАРАМЕТРЫ ВАРИАНТА ---
+A_SEMI_AXES = np.array([2, 3, 1.5, 2.5, 1, 4])
+ALPHA = np.array([-0.11668255, -1.90093714, -2.28172284])
+BETA  = np.array([3.74736003,  2.88284760,  1.59672290])
 
-def rho(x):
-    return np.sum(np.abs(x[:3] - alpha)**beta)
+N_VALUES = [10**3, 10**4, 10**5, 10**6]
 
-N_values = [10**3, 10**4, 10**5, 10**6]
 
-for N in N_values:
-    X = np.random.uniform(-a, a, size=(N, n))
-    mask = np.sum((X / a)**2, axis=1) <= 1
-    M = mask.sum()
-    X_in = X[mask]
-    if M == 0:
-        print(f"N={N}: внутри нет точек (M=0)")
-        continue
+def make_rho(alpha, beta):
+    """Векторизованная подынтегральная функция rho(x) = sum |x_k - alpha_k|^beta_k."""
+    k = len(alpha)
 
-    mean_rho_in = np.mean([rho(x) for x in X_in])
-    # правильная оценка интеграла
-    I_est = W_volume * (M / N) * mean_rho_in
-    # оценка объёма V
-    V_est = W_volume * (M / N)
+    def rho(X):
+        return np.sum(np.abs(X[:, :k] - alpha) ** beta, axis=1)
 
-    print(f"N={N:7d}  M={M:6d}  M/N={M/N:.6f}  mean_rho_in={mean_rho_in:.6f}  I_est={I_est:.6f}  V_est={V_est:.6f}")
+    return rho
+
+
+def make_ellipsoid_mask(a):
+    """Векторизованный индикатор гиперэллипсоида sum (x_i / a_i)^2 <= 1."""
+
+    def mask(X):
+        return np.sum((X / a) ** 2, axis=1) <= 1
+
+    return mask
+
+
+def make_integrator(a=A_SEMI_AXES, alpha=ALPHA, beta=BETA, **kwargs):
+    """Интегратор для варианта: rho по гиперэллипсоиду с полуосями a."""
+    a = np.asarray(a, dtype=float)
+    return MonteCarloIntegrator(
+        integrand=make_rho(alpha, beta),
+        lower=-a,
+        upper=a,
+        indicator=make_ellipsoid_mask(a),
+        **kwargs,
+    )
+
+
+if __name__ == "__main__":
+    integrator = make_integrator()
+
+    for N in N_VALUES:
+        res = integrator.integrate(N)
+        M = res.n_inside
+        if M == 0:
+            print(f"N={N}: внутри нет точек (M=0)")
+            continue
+
+        # Среднее rho по точкам внутри области: I = W * (M/N) * mean_rho_in
+        mean_rho_in = res.estimate / res.volume
+        print(f"N={N:7d}  M={M:6d}  M/N={M/N:.6f}  mean_rho_in={mean_rho_in:.6f}  "
+              f"I_est={res.estimate:.6f}  V_est={res.volume:.6f}  "
+              f"σ_I={res.std_error:.6f}  t={res.timings['total']:.3f}s")
 
 
 # N: Общее число испытаний (точек).
 # M: Число точек, попавших внутрь гиперэллипсоида.
-# M/N: Оценка вероятности попадания в область V. 
+# M/N: Оценка вероятности попадания в область V.
 # mean_rho_in: Оценка среднего значения p внутри области V.
-# I_est: Оценка значения интеграла I. 
-# V_est: Оценка объема области V.
\ No newline at end of file
+# I_est: Оценка значения интеграла I.
+# V_est: Оценка объема области V.
+# σ_I: Стандартная ошибка оценки интеграла.
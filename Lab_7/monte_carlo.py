@@ -0,0 +1,215 @@
+"""
+Общий движок интегрирования методом Монте-Карло.
+
+Интеграл I = ∫_V f(x) dx оценивается по точкам, равномерно распределённым
+в ограничивающем параллелепипеде W = [lower, upper] (или сразу в области V,
+если задан сэмплер). Все функции векторизованы: получают массив точек
+формы (m, d) и возвращают массив длины m.
+
+Точки обрабатываются порциями (chunk_size), поэтому память не зависит от
+общего числа испытаний N. Каждая порция получает собственный поток
+случайных чисел (SeedSequence.spawn), поэтому результат при заданном seed
+одинаков для последовательного и параллельного режимов.
+
+Режимы (backend):
+    "random"   - псевдослучайные точки (numpy.random.Generator);
+    "qmc"      - квазислучайные точки Соболя со скремблированием
+                 (scipy.stats.qmc): replicas независимых реплик по 2^k
+                 точек (N округляется до replicas * 2^k), каждая
+                 генерируется порциями по степени двойки; дисперсия -
+                 по разбросу оценок реплик;
+    "parallel" - псевдослучайные точки, порции считаются в пуле потоков.
+"""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+BACKENDS = ("random", "qmc", "parallel")
+
+
+@dataclass
+class MonteCarloResult:
+    """Результат интегрирования методом Монте-Карло."""
+    estimate: float          # оценка интеграла I
+    variance: float          # дисперсия оценки I
+    n_evaluations: int       # общее число испытаний N
+    n_inside: int            # число точек, попавших в область (M)
+    volume: float            # оценка объёма области V
+    backend: str
+    timings: dict = field(default_factory=dict)
+
+    @property
+    def std_error(self):
+        """Стандартная ошибка оценки."""
+        return float(np.sqrt(self.variance))
+
+
+class MonteCarloIntegrator:
+    """
+    Оценщик интеграла ∫_V f(x) dx по области V в пространстве размерности d.
+
+    Args:
+        integrand: векторизованная функция f(X), X.shape == (m, d).
+        lower, upper: границы ограничивающего параллелепипеда.
+        indicator: векторизованная функция-индикатор области V (маска bool).
+            Если не задана, интегрирование ведётся по всему параллелепипеду.
+        sampler: функция sampler(m, rng), возвращающая m точек, равномерно
+            распределённых в V. Требует известного объёма volume.
+        volume: объём области V (только вместе с sampler).
+        chunk_size: число точек, обрабатываемых за один проход (для "qmc"
+            округляется вниз до степени двойки).
+        backend: "random", "qmc" или "parallel".
+        workers: число потоков для режима "parallel".
+        seed: начальное значение генератора (для воспроизводимости).
+        replicas: число независимых реплик Соболя в режиме "qmc" (не меньше 2).
+    """
+
+    def __init__(self, integrand, lower, upper, indicator=None, sampler=None,
+                 volume=None, chunk_size=2 ** 16, backend="random",
+                 workers=None, seed=None, replicas=16):
+        if backend not in BACKENDS:
+            raise ValueError(f"Неизвестный режим '{backend}', допустимы: {BACKENDS}")
+        if sampler is not None and volume is None:
+            raise ValueError("Для сэмплера области необходимо указать её объём volume")
+        if sampler is not None and backend == "qmc":
+            raise ValueError("Режим 'qmc' работает только с ограничивающим параллелепипедом")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size должен быть положительным")
+        if replicas < 2:
+            raise ValueError("Для оценки дисперсии нужно не менее 2 реплик")
+
+        self.integrand = integrand
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        if self.lower.shape != self.upper.shape or self.lower.ndim != 1:
+            raise ValueError("lower и upper должны быть векторами одной длины")
+        self.dim = self.lower.size
+        self.indicator = indicator
+        self.sampler = sampler
+        self.volume = volume
+        self.chunk_size = int(chunk_size)
+        self.backend = backend
+        self.workers = workers
+        self.seed = seed
+        self.replicas = int(replicas)
+
+    @property
+    def box_volume(self):
+        """Объём ограничивающего параллелепипеда W."""
+        return float(np.prod(self.upper - self.lower))
+
+    def _sample(self, m, seed_seq):
+        """Генерирует m псевдослучайных точек для одной порции."""
+        rng = np.random.default_rng(seed_seq)
+        if self.sampler is not None:
+            return self.sampler(m, rng)
+        return rng.uniform(self.lower, self.upper, size=(m, self.dim))
+
+    def _evaluate(self, X):
+        """Суммы g и g^2 и число точек в области для порции точек X."""
+        m = X.shape[0]
+        if self.indicator is not None and self.sampler is None:
+            mask = np.asarray(self.indicator(X), dtype=bool)
+            inside = int(np.count_nonzero(mask))
+            g = np.zeros(m)
+            if inside:
+                g[mask] = self.integrand(X[mask])
+        else:
+            inside = m
+            g = np.asarray(self.integrand(X), dtype=float)
+        return g.sum(), np.dot(g, g), inside
+
+    def _run_chunk(self, m, seed_seq):
+        """Обрабатывает одну порцию, возвращает накопленные суммы и времена."""
+        t0 = time.perf_counter()
+        X = self._sample(m, seed_seq)
+        t1 = time.perf_counter()
+        total, total_sq, inside = self._evaluate(X)
+        t2 = time.perf_counter()
+        return total, total_sq, inside, m, t1 - t0, t2 - t1
+
+    def _run_replica(self, m, seed_seq):
+        """
+        Одна скремблированная реплика Соболя из m = 2^k точек. Порции - по
+        2^j точек, поэтому каждая порция (и вся реплика) - выровненный блок
+        последовательности с её свойствами равномерности.
+        """
+        from scipy.stats import qmc
+        engine = qmc.Sobol(d=self.dim, scramble=True, seed=np.random.default_rng(seed_seq))
+        step = min(m, 1 << (self.chunk_size.bit_length() - 1))
+        total = total_sq = 0.0
+        inside = 0
+        t_sample = t_eval = 0.0
+        for _ in range(m // step):
+            t0 = time.perf_counter()
+            X = qmc.scale(engine.random(step), self.lower, self.upper)
+            t1 = time.perf_counter()
+            s, s2, k = self._evaluate(X)
+            t_sample += t1 - t0
+            t_eval += time.perf_counter() - t1
+            total, total_sq, inside = total + s, total_sq + s2, inside + k
+        return total, total_sq, inside, m, t_sample, t_eval
+
+    def integrate(self, n_points):
+        """Оценивает интеграл по n_points испытаниям."""
+        n_points = int(n_points)
+        if n_points <= 0:
+            raise ValueError("Число испытаний должно быть положительным")
+
+        if self.backend == "qmc":
+            # replicas реплик одинакового размера 2^k, ближайшего к N / replicas
+            m = 1 << max(0, round(math.log2(n_points / self.replicas)))
+            sizes = [m] * self.replicas
+            n_points = m * self.replicas
+            run = self._run_replica
+        else:
+            sizes = [self.chunk_size] * (n_points // self.chunk_size)
+            if n_points % self.chunk_size:
+                sizes.append(n_points % self.chunk_size)
+            run = self._run_chunk
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+
+        t_start = time.perf_counter()
+        if self.backend == "parallel":
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                chunks = list(pool.map(run, sizes, seeds))
+        else:
+            chunks = [run(m, s) for m, s in zip(sizes, seeds)]
+        t_total = time.perf_counter() - t_start
+
+        sums, sumsq, inside, counts, t_sample, t_eval = (np.array(c) for c in zip(*chunks))
+
+        # Масштаб: объём области, по которой равномерно распределены точки
+        scale = self.volume if self.sampler is not None else self.box_volume
+        mean_g = sums.sum() / n_points
+        estimate = scale * mean_g
+
+        if self.backend == "qmc":
+            # Дисперсия рандомизированного QMC - по разбросу независимых
+            # реплик одинакового размера
+            replica_estimates = scale * sums / counts
+            variance = np.var(replica_estimates, ddof=1) / len(sizes)
+        else:
+            var_g = max(sumsq.sum() / n_points - mean_g ** 2, 0.0)
+            variance = scale ** 2 * var_g / n_points
+
+        n_inside = int(inside.sum())
+        volume = self.volume if self.sampler is not None else scale * n_inside / n_points
+
+        return MonteCarloResult(
+            estimate=float(estimate),
+            variance=float(variance),
+            n_evaluations=n_points,
+            n_inside=n_inside,
+            volume=float(volume),
+            backend=self.backend,
+            timings={
+                "sampling": float(t_sample.sum()),
+                "evaluation": float(t_eval.sum()),
+                "total": t_total,
+            },
+        )
@@ -0,0 +1,276 @@
+"""
+Итерационные методы решения СЛАУ A x = b: Якоби, Зейдель, ПВР (SOR) и
+симметричный ПВР (SSOR).
+
+Вектор x обновляется на месте. Строки обрабатываются полосами по
+block_size: вклад всех уже пересчитанных и ещё не пересчитанных
+компонент берётся одним произведением матрицы полосы на x, а внутри
+полосы решается треугольная система. Результат совпадает с
+построчным методом Зейделя/ПВР, но число вызовов Python на одну
+итерацию - n / block_size вместо O(n).
+
+Сходимость проверяется по относительной невязке ||b - A x|| / ||b||
+каждые check_every итераций.
+
+Кроме плотного массива A может быть безматричным оператором с методами
+rows(start, stop), diagonal() и умножением A @ x (см. matrix_free.py):
+тогда полоса строк генерируется непосредственно перед обновлением.
+
+Точная невязка требует A @ x, то есть ещё одного прохода по всем n^2
+элементам. Поэтому проходы возвращают норму невязок своих полос, которые
+они всё равно вычисляют: у Якоби это точная невязка приближения до
+прохода, у Зейделя/ПВР - невязка с частично обновлённым x. Пока эта
+оценка не меньше tol, точная невязка не считается (у ПВР - только для
+безматричного оператора, где она особенно дорога); сходимость всегда
+подтверждается точной невязкой.
+
+Все решатели принимают необязательный monitor (utils.convergence):
+через него подключаются callback на каждую проверку невязки и
+ограниченная по памяти история.
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.linalg import solve_triangular
+
+import _paths  # корень репозитория в sys.path (для utils)
+from utils.convergence import ConvergenceMonitor, ConvergenceReport
+
+DEFAULT_BLOCK_SIZE = 256
+
+
+@dataclass
+class SolverResult(ConvergenceReport):
+    """Результат итерационного решения СЛАУ."""
+    x: np.ndarray = None
+    method: str = ""
+    time_per_sweep: float = 0.0      # среднее время итерации без проверок невязки, с
+
+    @property
+    def residual(self):
+        """Последняя относительная невязка."""
+        return self.last_value
+
+    @property
+    def residual_history(self):
+        return [value for _, value, _ in self.history]
+
+    @property
+    def total_time(self):
+        return self.wall_time
+
+
+def make_result(monitor, x, iterations, converged, method, sweep_time=None):
+    """Завершает наблюдение и упаковывает итог в SolverResult."""
+    report = monitor.finish(iterations, converged)
+    if sweep_time is None:
+        sweep_time = report.wall_time
+    return SolverResult(
+        **vars(report),
+        x=x,
+        method=method,
+        time_per_sweep=sweep_time / iterations if iterations else 0.0,
+    )
+
+
+def relative_residual(A, x, b, b_norm=None):
+    """Относительная невязка ||b - A x|| / ||b|| (для массивов, sparse и LinearOperator)."""
+    if b_norm is None:
+        b_norm = np.linalg.norm(b)
+    r = np.linalg.norm(b - A @ x)
+    return r / b_norm if b_norm > 0 else r
+
+
+def jacobi_spectral_radius(matvec, diag, iters=30, seed=0):
+    """
+    Оценивает спектральный радиус матрицы итераций Якоби
+    B = I - D^{-1} A степенным методом (нужно только A @ v).
+    """
+    rng = np.random.default_rng(seed)
+    v = rng.random(diag.size)
+    v /= np.linalg.norm(v)
+    rho = 0.0
+    for _ in range(iters):
+        w = v - matvec(v) / diag
+        norm_w = np.linalg.norm(w)
+        if norm_w == 0:
+            return 0.0
+        rho = norm_w
+        v = w / norm_w
+    return rho
+
+
+def optimal_omega(rho_jacobi):
+    """
+    Оптимальный параметр релаксации ω = 2 / (1 + sqrt(1 - ρ²)),
+    где ρ - спектральный радиус матрицы Якоби (ρ < 1).
+    """
+    if rho_jacobi >= 1:
+        return 1.0
+    return 2.0 / (1.0 + np.sqrt(1.0 - rho_jacobi ** 2))
+
+
+def sor_sweep(rows, b, x, omega, block_size, reverse=False):
+    """
+    Одна итерация ПВР на месте.
+
+    rows(start, stop) возвращает строки start..stop-1 матрицы A.
+    reverse=True - обратный проход (вторая половина SSOR).
+    Возвращает сумму квадратов невязок полос (до их обновления).
+    """
+    n = x.size
+    norm2 = 0.0
+    starts = list(range(0, n, block_size))
+    if reverse:
+        starts.reverse()
+    for start in starts:
+        stop = min(start + block_size, n)
+        R = rows(start, stop)
+        T = R[:, start:stop]
+        xb = x[start:stop]
+        d = np.diag(T)
+
+        # Невязка полосы с текущим x (слева уже новые значения, справа - старые)
+        r = b[start:stop] - R @ x
+        norm2 += float(np.dot(r, r))
+        if reverse:
+            rhs = omega * (r + np.triu(T) @ xb) + (1.0 - omega) * d * xb
+            M = omega * np.triu(T, 1)
+        else:
+            rhs = omega * (r + np.tril(T) @ xb) + (1.0 - omega) * d * xb
+            M = omega * np.tril(T, -1)
+        M[np.diag_indices_from(M)] = d
+        x[start:stop] = solve_triangular(M, rhs, lower=not reverse, check_finite=False)
+    return norm2
+
+
+def lazy_residual(A, x, b, tol, estimate):
+    """
+    Функция проверки невязки для run_sweeps: пока оценка estimate() (норма
+    невязок, собранных проходом, или None) не меньше tol, возвращает её,
+    иначе - точную относительную невязку ||b - A x|| / ||b||.
+    """
+    b_norm = np.linalg.norm(b)
+
+    def residual():
+        norm = estimate()
+        if norm is not None:
+            value = norm / b_norm if b_norm > 0 else norm
+            if value >= tol:
+                return value
+        return relative_residual(A, x, b, b_norm)
+    return residual
+
+
+def run_sweeps(sweep, residual, x, tol, max_iter, check_every, method, monitor=None):
+    """Общий цикл итераций: выполняет sweep() и проверяет невязку каждые check_every шагов."""
+    check_every = max(1, int(check_every))
+    monitor = ConvergenceMonitor() if monitor is None else monitor
+    monitor.start()
+    sweep_time = 0.0
+    res = residual()
+    monitor.record(0, res)
+    k = 0
+    converged = res < tol
+    while not converged and k < max_iter:
+        t0 = time.perf_counter()
+        sweep()
+        sweep_time += time.perf_counter() - t0
+        k += 1
+        if k % check_every == 0 or k == max_iter:
+            res = residual()
+            monitor.record(k, res)
+            converged = res < tol
+    return make_result(monitor, x, k, converged, method, sweep_time)
+
+
+def _prepare(A, b, x0, block_size):
+    """Общая подготовка: строки A по полосам, диагональ, начальное приближение."""
+    if hasattr(A, "rows"):
+        rows = A.rows
+        if block_size is None:
+            block_size = getattr(A, "block_size", DEFAULT_BLOCK_SIZE)
+    else:
+        A = np.asarray(A)
+
+        def rows(start, stop):
+            return A[start:stop]
+
+    b = np.asarray(b, dtype=float)
+    n = b.size
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float)
+    block_size = min(n, int(block_size or DEFAULT_BLOCK_SIZE))
+    return A, rows, b, x, block_size
+
+
+def sor(A, b, omega=1.0, symmetric=False, x0=None, tol=1e-10, max_iter=10000,
+        check_every=1, block_size=None, monitor=None):
+    """
+    Метод ПВР (SOR).
+
+    Args:
+        A: плотная матрица или безматричный оператор с методом rows().
+        omega: параметр релаксации (0 < ω < 2) или "auto" - оценка
+            оптимального ω по спектральному радиусу матрицы Якоби.
+        symmetric: True - симметричный ПВР (прямой + обратный проход).
+        tol: требуемая относительная невязка.
+        check_every: невязка проверяется каждые check_every итераций.
+        block_size: число строк в полосе (по умолчанию DEFAULT_BLOCK_SIZE).
+        monitor: ConvergenceMonitor для callback и истории невязок.
+    """
+    A, rows, b, x, block_size = _prepare(A, b, x0, block_size)
+    if omega == "auto":
+        omega = optimal_omega(jacobi_spectral_radius(lambda v: A @ v, A.diagonal()))
+    if not 0 < omega < 2:
+        raise ValueError("Параметр релаксации ω должен лежать в (0, 2)")
+
+    band_norm = [None]
+
+    def sweep():
+        norm2 = sor_sweep(rows, b, x, omega, block_size)
+        if symmetric:
+            sor_sweep(rows, b, x, omega, block_size, reverse=True)
+        if hasattr(A, "rows"):
+            band_norm[0] = np.sqrt(norm2)
+
+    method = ("SSOR" if symmetric else "SOR" if omega != 1.0 else "Gauss-Seidel")
+    return run_sweeps(sweep, lazy_residual(A, x, b, tol, lambda: band_norm[0]),
+                      x, tol, max_iter, check_every, f"{method} (ω={omega:.4f})", monitor)
+
+
+def gauss_seidel(A, b, **kwargs):
+    """Метод Зейделя - ПВР с ω = 1."""
+    return sor(A, b, omega=1.0, **kwargs)
+
+
+def ssor(A, b, omega="auto", **kwargs):
+    """Симметричный метод ПВР."""
+    return sor(A, b, omega=omega, symmetric=True, **kwargs)
+
+
+def jacobi(A, b, omega=1.0, x0=None, tol=1e-10, max_iter=10000,
+           check_every=1, block_size=None, monitor=None):
+    """
+    Метод Якоби (с весом ω): x = x + ω D^{-1} (b - A x).
+
+    Невязка b - A x собирается по полосам строк в заранее выделенный
+    буфер, поэтому дополнительная память - O(n).
+    """
+    A, rows, b, x, block_size = _prepare(A, b, x0, block_size)
+    d = np.asarray(A.diagonal(), dtype=float)
+    r = np.empty_like(x)
+    r_norm = [None]
+
+    def sweep():
+        for start in range(0, x.size, block_size):
+            stop = min(start + block_size, x.size)
+            np.subtract(b[start:stop], rows(start, stop) @ x, out=r[start:stop])
+        r_norm[0] = np.linalg.norm(r)     # точная невязка x до прохода
+        np.divide(r, d, out=r)
+        np.multiply(r, omega, out=r)
+        np.add(x, r, out=x)
+
+    return run_sweeps(sweep, lazy_residual(A, x, b, tol, lambda: r_norm[0]),
+                      x, tol, max_iter, check_every, f"Jacobi (ω={omega:.4f})", monitor)
@@ -0,0 +1,115 @@
+"""
+Крыловские методы для больших разреженных систем Лабораторной работы 8:
+метод сопряжённых градиентов (CG), BiCGSTAB и GMRES с предобуславливателями
+Якоби и неполного LU-разложения (ILU).
+
+Матрица A может быть плотным массивом, разреженной матрицей scipy.sparse
+(приводится к CSR) или LinearOperator. Невязка считается той же функцией
+relative_residual, что и в iterative.py, а результат возвращается в виде
+SolverResult, поэтому методы можно сравнивать с Зейделем/ПВР напрямую.
+
+CG применим только к симметричным положительно определенным матрицам;
+матрица Лабораторной работы 8 (и ее ленточное приближение) несимметрична,
+для нее подходят BiCGSTAB и GMRES.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, bicgstab, cg, gmres, spilu
+
+from iterative import ConvergenceMonitor, make_result, relative_residual
+
+METHODS = {"cg": cg, "bicgstab": bicgstab, "gmres": gmres}
+
+
+def jacobi_preconditioner(A, diag=None):
+    """
+    Предобуславливатель Якоби M = D^{-1}. Диагональ берется из A.diagonal()
+    (есть у массивов, sparse и FormulaMatrix); для LinearOperator без этого
+    метода её нужно передать явно (diag=...).
+    """
+    if diag is None:
+        diagonal = getattr(A, "diagonal", None)
+        if diagonal is None:
+            raise ValueError("Для LinearOperator без diagonal() диагональ нужно передать явно (diag=...)")
+        diag = diagonal()
+    inv_diag = 1.0 / np.asarray(diag, dtype=float)
+    n = inv_diag.size
+    return LinearOperator((n, n), matvec=lambda v: inv_diag * v.ravel(), dtype=float)
+
+
+def ilu_preconditioner(A, drop_tol=1e-4, fill_factor=10):
+    """Предобуславливатель неполного LU-разложения (spilu)."""
+    if isinstance(A, LinearOperator):
+        raise ValueError("ILU требует явной матрицы, а не LinearOperator")
+    ilu = spilu(sp.csc_matrix(A), drop_tol=drop_tol, fill_factor=fill_factor)
+    return LinearOperator(A.shape, matvec=ilu.solve, dtype=float)
+
+
+def _as_operator(A):
+    if sp.issparse(A):
+        return A.tocsr()
+    if isinstance(A, LinearOperator):
+        return A
+    return np.asarray(A)
+
+
+def _preconditioner(A, preconditioner, diag):
+    if preconditioner is None or isinstance(preconditioner, LinearOperator):
+        return preconditioner
+    if preconditioner == "jacobi":
+        return jacobi_preconditioner(A, diag)
+    if preconditioner == "ilu":
+        return ilu_preconditioner(A)
+    raise ValueError(f"Неизвестный предобуславливатель '{preconditioner}'")
+
+
+def krylov_solve(A, b, method="cg", preconditioner=None, x0=None, tol=1e-10,
+                 max_iter=1000, check_every=1, restart=30, diag=None, monitor=None):
+    """
+    Решает A x = b крыловским методом.
+
+    Args:
+        method: "cg" (симметричные положительно определённые A),
+            "bicgstab" или "gmres".
+        preconditioner: None, "jacobi", "ilu" или готовый LinearOperator.
+        tol: требуемая относительная невязка ||b - A x|| / ||b||.
+        check_every: невязка записывается в историю каждые check_every итераций
+            (для GMRES итерация - один цикл перезапуска).
+        restart: размер подпространства GMRES до перезапуска.
+        diag: диагональ A для предобуславливателя Якоби при LinearOperator.
+        monitor: ConvergenceMonitor для callback и истории невязок.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод '{method}', допустимы: {tuple(METHODS)}")
+    A = _as_operator(A)
+    b = np.asarray(b, dtype=float)
+    b_norm = np.linalg.norm(b)
+    check_every = max(1, int(check_every))
+
+    monitor = ConvergenceMonitor() if monitor is None else monitor
+    monitor.start()
+    M = _preconditioner(A, preconditioner, diag)
+
+    monitor.record(0, relative_residual(A, np.zeros_like(b) if x0 is None else x0, b, b_norm))
+    iterations = 0
+
+    def callback(xk):
+        nonlocal iterations
+        iterations += 1
+        if iterations % check_every == 0:
+            monitor.record(iterations, relative_residual(A, xk, b, b_norm))
+
+    kwargs = {"x0": x0, "rtol": tol, "atol": 0.0, "maxiter": max_iter,
+              "M": M, "callback": callback}
+    if method == "gmres":
+        kwargs.update(restart=restart, callback_type="x")
+    x, _ = METHODS[method](A, b, **kwargs)
+
+    res = relative_residual(A, x, b, b_norm)
+    if iterations % check_every:
+        monitor.record(iterations, res)
+    name = method.upper()
+    if preconditioner is not None:
+        name += f" + {preconditioner if isinstance(preconditioner, str) else 'M'}"
+    return make_result(monitor, x, iterations, res < tol, name)
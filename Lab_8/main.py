@@ -1,5 +1,11 @@
 import numpy as np
 
+from matrices import create_matrix_a, create_matrix_a_sparse, create_vector_b
+from iterative import gauss_seidel, sor
+from krylov import krylov_solve
+from lu_cache import lu_solve_cached
+from mixed_precision import solve_mixed_precision
+
 # -----------------------------
 # ПАРАМЕТРЫ ВАРИАНТА
 # -----------------------------
@@ -10,17 +16,8 @@ np.set_printoptions(precision=6, suppress=True)
 # -----------------------------
 # ГЕНЕРАЦИЯ МАТРИЦЫ A и ВЕКТОРА b
 # -----------------------------
-A = np.zeros((n, n), dtype=float)
-b = np.zeros(n, dtype=float)
-
-for i in range(n):
-    for j in range(n):
-        if i == j:
-            A[i, j] = 10 * (i + 1) ** (n / 2)
-        else:
-            sign = (-1) ** (i + j)  # чередуем знаки
-            A[i, j] = sign * 1e-3 * ((i + 1) / (j + 1)) ** (1 / q)
-    b[i] = 9 * (i + 1) ** (n / 2)
+A = create_matrix_a(n, q)
+b = create_vector_b(n)
 
 print("Матрица A:\n", A)
 print("Вектор b:\n", b)
@@ -28,28 +25,33 @@ print("Вектор b:\n", b)
 # -----------------------------
 # РЕШЕНИЕ МЕТОДОМ ФАКТОРИЗАЦИИ (LU)
 # -----------------------------
-x_lu = np.linalg.solve(A, b)
+x_lu = lu_solve_cached(A, b)
 print("\nРешение методом LU:\n", x_lu)
 
+# Повторные решения с той же A берут разложение из кэша: O(n^2) на правую часть,
+# блок правых частей решается одним вызовом
+B_many = np.random.default_rng(0).random((n, 1000))
+X_many = lu_solve_cached(A, B_many)
+print("Решено правых частей с одним разложением:", X_many.shape[1])
+
+# Смешанная точность: разложение в float32, невязка и уточнение в float64
+mp = solve_mixed_precision(A, b)
+print(f"{mp.method}: шагов уточнения {mp.iterations}, невязка {mp.residual:.2e}")
+
 # -----------------------------
 # РЕШЕНИЕ МЕТОДОМ ЗЕЙДЕЛЯ
 # -----------------------------
-def gauss_seidel(A, b, eps=1e-10, max_iter=10000):
-    n = len(A)
-    x = np.zeros(n)
-    for k in range(max_iter):
-        x_old = x.copy()
-        for i in range(n):
-            s1 = np.dot(A[i, :i], x[:i])
-            s2 = np.dot(A[i, i + 1:], x_old[i + 1:])
-            x[i] = (b[i] - s1 - s2) / A[i, i]
-        if np.linalg.norm(x - x_old, ord=np.inf) < eps:
-            print(f"\nМетод Зейделя сошёлся за {k + 1} итераций.")
-            return x
+gs = gauss_seidel(A, b, tol=1e-12)
+x_gs = gs.x
+if gs.converged:
+    print(f"\nМетод Зейделя сошёлся за {gs.iterations} итераций.")
+else:
     print("⚠ Не сошёлся за указанное число итераций")
-    return x
 
-x_gs = gauss_seidel(A, b)
+# Метод ПВР с автоматическим выбором ω
+res_sor = sor(A, b, omega="auto", tol=1e-12)
+print(f"{res_sor.method}: итераций {res_sor.iterations}, "
+      f"время итерации {res_sor.time_per_sweep * 1e6:.1f} мкс")
 
 print("\nРешение методом Зейделя:\n", x_gs)
 
@@ -61,3 +63,17 @@ r_gs = np.dot(A, x_gs) - b
 
 print("\nНевязка LU:", np.linalg.norm(r_lu))
 print("Невязка Зейделя:", np.linalg.norm(r_gs))
+
+# -----------------------------
+# БОЛЬШАЯ РАЗРЕЖЕННАЯ СИСТЕМА (CSR + крыловские методы)
+# -----------------------------
+# Показатель n/2 на диагонали при больших n переполняется, поэтому берём 1/2.
+# Ленточная матрица - приближенная система (решение отличается от решения
+# полной матрицы ~1e-4); матрица несимметрична, поэтому CG не используется
+n_big = 10**5
+A_big = create_matrix_a_sparse(n_big, q, bandwidth=2, diag_power=0.5)
+b_big = create_vector_b(n_big, diag_power=0.5)
+for method in ("bicgstab", "gmres"):
+    res = krylov_solve(A_big, b_big, method=method, preconditioner="jacobi")
+    print(f"{res.method}: n={n_big}, итераций {res.iterations}, "
+          f"невязка {res.residual:.2e}, время {res.total_time:.3f} с")
@@ -0,0 +1,126 @@
+"""
+Генерация матрицы A и вектора b для Лабораторной работы 8 (Вариант 3).
+
+    a_ii = 10 * i^(n/2)
+    a_ij = (-1)^(i+j) * 1e-3 * (i / j)^(1/q),   i != j
+    b_i  = 9 * i^(n/2)
+
+(индексы i, j от 1 до n). Внедиагональная часть - внешнее произведение
+двух векторов: (-1)^i * i^(1/q) и (-1)^j * j^(-1/q), поэтому матрица
+заполняется без двойного цикла Python. В блочном режиме строки
+заполняются полосами по block_size, так что кроме самой матрицы
+временная память не нужна (можно передать np.memmap через out).
+
+Для очень больших n есть разреженный вариант: матрица усекается до ленты
+ширины bandwidth и хранится в формате CSR. Это другая, приближенная
+система, а не матрица Лабораторной работы 8: отброшенные элементы ~1e-3
+не малы в сумме по строке, и при diag_power=0.5, n=4000 решение ленточной
+системы отличается от точного примерно на 1e-4 (относительно). Точную
+матрицу без хранения n x n дает FormulaMatrix (matrix_free.py). Кроме
+того, ленточная матрица, как и исходная, несимметрична.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def _diag_power(n, diag_power):
+    return n / 2 if diag_power is None else diag_power
+
+
+def matrix_a_rows(n, q, start, stop, dtype=float, diag_power=None, out=None):
+    """
+    Возвращает строки start..stop-1 матрицы A (форма (stop-start, n)).
+
+    Используется для поблочного заполнения и в безматричных решателях.
+    """
+    dtype = np.dtype(dtype)
+    idx = np.arange(1, n + 1, dtype=np.float64)
+    sign = np.where(np.arange(n) % 2 == 0, 1.0, -1.0)
+
+    rows = idx[start:stop]
+    left = 1e-3 * sign[start:stop] * rows ** (1.0 / q)
+    right = sign * idx ** (-1.0 / q)
+
+    if out is None:
+        out = np.empty((stop - start, n), dtype=dtype)
+    np.multiply.outer(left.astype(dtype), right.astype(dtype), out=out)
+
+    # Диагональ попадает в полосу на позициях (k, start + k)
+    k = np.arange(stop - start)
+    out[k, start + k] = 10 * rows ** _diag_power(n, diag_power)
+    return out
+
+
+def matrix_a_columns(n, q, start, stop, dtype=float, diag_power=None, out=None):
+    """
+    Возвращает столбцы start..stop-1 матрицы A в виде строк A^T
+    (форма (stop-start, n)): a_ji = (-1)^(i+j) * 1e-3 * (j / i)^(1/q).
+    """
+    dtype = np.dtype(dtype)
+    idx = np.arange(1, n + 1, dtype=np.float64)
+    sign = np.where(np.arange(n) % 2 == 0, 1.0, -1.0)
+
+    cols = idx[start:stop]
+    left = 1e-3 * sign[start:stop] * cols ** (-1.0 / q)
+    right = sign * idx ** (1.0 / q)
+
+    if out is None:
+        out = np.empty((stop - start, n), dtype=dtype)
+    np.multiply.outer(left.astype(dtype), right.astype(dtype), out=out)
+
+    k = np.arange(stop - start)
+    out[k, start + k] = 10 * cols ** _diag_power(n, diag_power)
+    return out
+
+
+def create_matrix_a(n, q, dtype=float, block_size=None, diag_power=None, out=None):
+    """
+    Создаёт матрицу A размера n x n.
+
+    Args:
+        n: размерность системы.
+        q: параметр варианта.
+        dtype: тип элементов (например, np.float32 для экономии памяти).
+        block_size: число строк в полосе блочного режима; None - одним блоком.
+        diag_power: показатель степени на диагонали (по умолчанию n/2).
+        out: готовый массив (n, n) для записи, например np.memmap.
+    """
+    if out is None:
+        out = np.empty((n, n), dtype=dtype)
+    step = n if block_size is None else max(1, int(block_size))
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        matrix_a_rows(n, q, start, stop, dtype=out.dtype, diag_power=diag_power,
+                      out=out[start:stop])
+    return out
+
+
+def create_vector_b(n, dtype=float, diag_power=None):
+    """Создаёт правую часть b_i = 9 * i^(n/2)."""
+    idx = np.arange(1, n + 1, dtype=np.float64)
+    return (9 * idx ** _diag_power(n, diag_power)).astype(dtype)
+
+
+def create_matrix_a_sparse(n, q, bandwidth=1, dtype=float, diag_power=None):
+    """
+    Ленточное приближение матрицы A в формате CSR: сохраняются только
+    элементы с |i - j| <= bandwidth. Память - O(n * bandwidth). Решение
+    отличается от решения полной системы (см. описание модуля).
+
+    При больших n показатель n/2 на диагонали даёт переполнение,
+    поэтому для таких экспериментов следует задать diag_power.
+    """
+    idx = np.arange(1, n + 1, dtype=np.float64)
+    offsets = []
+    diagonals = []
+    for k in range(-bandwidth, bandwidth + 1):
+        if k == 0:
+            values = 10 * idx ** _diag_power(n, diag_power)
+        else:
+            # a_{i, i+k}: строки i = max(0, -k) .. min(n, n-k) - 1
+            i = idx[max(0, -k):min(n, n - k)]
+            values = (-1) ** abs(k) * 1e-3 * (i / (i + k)) ** (1.0 / q)
+        offsets.append(k)
+        diagonals.append(values.astype(dtype))
+    return sp.diags(diagonals, offsets, shape=(n, n), format="csr", dtype=dtype)
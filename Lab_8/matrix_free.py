@@ -0,0 +1,80 @@
+"""
+Безматричное представление матрицы Лабораторной работы 8.
+
+Элемент a_ij задан формулой от (i, j, n, q), поэтому хранить n x n массив
+не обязательно: FormulaMatrix генерирует полосу строк по требованию
+(matrix_a_rows) и сразу использует её. Память - O(n * block_size) вместо
+O(n^2): при n = 10^5 плотная матрица заняла бы 80 ГБ.
+
+FormulaMatrix - это scipy LinearOperator, поэтому подходит и для
+крыловских методов (krylov.py), и для jacobi/gauss_seidel/sor из
+iterative.py, которые вызывают rows() прямо внутри итерации. Транспонированный
+оператор (A.T, A.H, rmatvec) генерирует полосы столбцов (matrix_a_columns).
+"""
+
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+
+from matrices import matrix_a_columns, matrix_a_rows
+
+# Ограничение на размер одной полосы строк (число элементов)
+MAX_BLOCK_ELEMENTS = 4 * 1024 * 1024
+
+
+class FormulaMatrix(LinearOperator):
+    """
+    Матрица A(n, q) Лабораторной работы 8 без хранения элементов.
+
+    Args:
+        n, q: параметры варианта.
+        diag_power: показатель степени на диагонали (по умолчанию n/2).
+        block_size: число строк, генерируемых за раз; по умолчанию
+            подбирается так, чтобы полоса занимала ~32 МБ.
+        dtype: тип генерируемых элементов.
+    """
+
+    def __init__(self, n, q, diag_power=None, block_size=None, dtype=float):
+        super().__init__(dtype=np.dtype(dtype), shape=(n, n))
+        self.n = n
+        self.q = q
+        self.diag_power = diag_power
+        if block_size is None:
+            block_size = max(1, MAX_BLOCK_ELEMENTS // n)
+        self.block_size = min(n, int(block_size))
+
+    def rows(self, start, stop):
+        """Строки start..stop-1 матрицы A."""
+        return matrix_a_rows(self.n, self.q, start, stop, dtype=self.dtype,
+                             diag_power=self.diag_power)
+
+    def diagonal(self):
+        idx = np.arange(1, self.n + 1, dtype=np.float64)
+        power = self.n / 2 if self.diag_power is None else self.diag_power
+        return 10 * idx ** power
+
+    def columns(self, start, stop):
+        """Столбцы start..stop-1 матрицы A (строки A^T)."""
+        return matrix_a_columns(self.n, self.q, start, stop, dtype=self.dtype,
+                                diag_power=self.diag_power)
+
+    def _apply(self, bands, X):
+        """Произведение матрицы, заданной полосами строк bands(start, stop), на X."""
+        X = np.asarray(X)
+        Y = np.empty((self.n, X.shape[1]), dtype=np.result_type(self.dtype, X.dtype))
+        for start in range(0, self.n, self.block_size):
+            stop = min(start + self.block_size, self.n)
+            np.matmul(bands(start, stop), X, out=Y[start:stop])
+        return Y
+
+    def _matmat(self, X):
+        return self._apply(self.rows, X)
+
+    def _matvec(self, x):
+        return self._matmat(np.asarray(x).reshape(-1, 1)).ravel()
+
+    def _rmatmat(self, X):
+        # A^T по той же формуле: a_ji генерируется полосами столбцов
+        return self._apply(self.columns, X)
+
+    def _rmatvec(self, x):
+        return self._rmatmat(np.asarray(x).reshape(-1, 1)).ravel()
@@ -0,0 +1,92 @@
+"""
+Степенной метод сразу для стопки матриц формы (batch, n, n).
+
+Когда нужно перебрать много наборов параметров (N, P, Q, B), вызывать
+power_method в цикле невыгодно: на маленьких матрицах время уходит на
+интерпретатор, а не на умножение. Здесь все матрицы обрабатываются одним
+пакетным умножением A @ e, отношение Рэлея считается для каждой матрицы
+("дорожки") отдельно, а сошедшиеся дорожки исключаются из дальнейших
+итераций. Критерий остановки тот же, что в power_method:
+|λ^(k) - λ^(k-1)| < epsilon.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from main import create_matrix_a
+
+STATUS_CONVERGED = "Сходимость достигнута"
+STATUS_K_MAX = "k_max достигнут"
+
+
+@dataclass
+class BatchedPowerResult:
+    """Результаты по каждой матрице стопки."""
+    eigenvalues: np.ndarray   # (batch,)
+    eigenvectors: np.ndarray  # (batch, n), нормированные
+    iterations: np.ndarray    # (batch,) число итераций каждой дорожки
+    converged: np.ndarray     # (batch,) bool
+
+    @property
+    def statuses(self):
+        return [STATUS_CONVERGED if c else STATUS_K_MAX for c in self.converged]
+
+
+def power_method_batched(A, epsilon, k_max, x0=None, seed=None):
+    """
+    Степенной метод для стопки матриц A формы (batch, n, n).
+
+    x0 - начальные векторы (batch, n); по умолчанию случайные в (0, 1)
+    из генератора с заданным seed.
+    """
+    A = np.asarray(A, dtype=float)
+    if A.ndim != 3 or A.shape[1] != A.shape[2]:
+        raise ValueError("Ожидается массив формы (batch, n, n)")
+    batch, n, _ = A.shape
+
+    if x0 is None:
+        x = np.random.default_rng(seed).random((batch, n))
+    else:
+        x = np.array(x0, dtype=float).reshape(batch, n)
+
+    eigenvalues = np.zeros(batch)
+    iterations = np.full(batch, k_max)
+    converged = np.zeros(batch, dtype=bool)
+
+    active = np.arange(batch)       # номера ещё не сошедшихся дорожек
+    A_act, x_act = A, x
+    lam_act = np.zeros(batch)
+    for k in range(1, k_max + 1):
+        e = x_act / np.linalg.norm(x_act, axis=1, keepdims=True)
+        x_new = np.matmul(A_act, e[:, :, None])[:, :, 0]
+        lam_new = np.einsum("bi,bi->b", x_new, e)
+
+        done = np.abs(lam_new - lam_act) < epsilon
+        lam_act, x_act = lam_new, x_new
+        if np.any(done):
+            idx = active[done]
+            eigenvalues[idx] = lam_new[done]
+            x[idx] = x_new[done]
+            iterations[idx] = k
+            converged[idx] = True
+
+            keep = ~done
+            active, A_act = active[keep], A_act[keep]
+            lam_act, x_act = lam_act[keep], x_act[keep]
+            if active.size == 0:
+                break
+
+    # Дорожки, не сошедшиеся за k_max итераций
+    eigenvalues[active] = lam_act
+    x[active] = x_act
+    eigenvectors = x / np.linalg.norm(x, axis=1, keepdims=True)
+    return BatchedPowerResult(eigenvalues, eigenvectors, iterations, converged)
+
+
+def create_matrix_stack(n, params):
+    """Стопка матриц create_matrix_a(n, p, q, b) для списка params = [(p, q, b), ...]."""
+    stack = np.empty((len(params), n, n))
+    for i, (p, q, b) in enumerate(params):
+        create_matrix_a(n, p, q, b, out=stack[i])
+    return stack
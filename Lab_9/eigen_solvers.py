@@ -0,0 +1,219 @@
+"""
+Методы поиска нескольких собственных пар для Лабораторной работы 9.
+
+    inverse_iteration           - обратные итерации со сдвигом σ: сходится к
+                                  собственному значению, ближайшему к σ.
+                                  Матрица A - σI раскладывается (LU) один раз.
+    rayleigh_quotient_iteration - обратные итерации со сдвигом, равным
+                                  отношению Рэлея на каждом шаге
+                                  (кубическая сходимость для симметричных A).
+    top_k_eigenpairs            - k наибольших по модулю собственных пар
+                                  степенным методом с исчерпыванием
+                                  (Хотеллинга или Виландта).
+
+Каждый метод возвращает EigenResult с числом итераций и невязкой
+||A x - λ x|| (при ||x|| = 1).
+"""
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import LinearOperator
+
+import _paths  # корень репозитория в sys.path (для utils)
+from utils.convergence import ConvergenceMonitor, ConvergenceReport
+
+
+@dataclass
+class EigenResult(ConvergenceReport):
+    """Собственная пара и сведения о сходимости (last_value - невязка)."""
+    eigenvalue: float = np.nan
+    eigenvector: np.ndarray = None
+    method: str = ""
+
+    @property
+    def residual(self):
+        """Невязка ||A x - λ x||."""
+        return self.last_value
+
+
+def _start_vector(n, x0, seed):
+    x = np.random.default_rng(seed).random(n) if x0 is None else np.array(x0, dtype=float).ravel()
+    return x / np.linalg.norm(x)
+
+
+def _rayleigh(A, x):
+    """Отношение Рэлея и A x для нормированного x."""
+    y = A @ x
+    return float(x @ y), y
+
+
+def _pack(monitor, k, converged, lam, x, method):
+    report = monitor.finish(k, converged)
+    return EigenResult(**vars(report), eigenvalue=lam, eigenvector=x, method=method)
+
+
+def _converged(residual, lam, tol):
+    return bool(residual <= tol * max(abs(lam), 1.0))
+
+
+def inverse_iteration(A, shift, tol=1e-10, max_iter=500, x0=None, seed=None, monitor=None):
+    """
+    Обратные итерации со сдвигом: (A - σI) x^(k) = x^(k-1).
+
+    Разложение A - σI вычисляется один раз и используется на всех итерациях.
+    Остановка - по относительной невязке ||A x - λ x|| <= tol * max(|λ|, 1).
+    """
+    A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    monitor = ConvergenceMonitor() if monitor is None else monitor
+    monitor.start()
+
+    factor = lu_factor(A - shift * np.eye(n), check_finite=False)
+    x = _start_vector(n, x0, seed)
+    lam = shift
+    for k in range(1, max_iter + 1):
+        x = lu_solve(factor, x, check_finite=False)
+        x /= np.linalg.norm(x)
+        lam, y = _rayleigh(A, x)
+        residual = np.linalg.norm(y - lam * x)
+        monitor.record(k, residual)
+        if _converged(residual, lam, tol):
+            return _pack(monitor, k, True, lam, x, f"Обратные итерации (σ={shift:g})")
+    return _pack(monitor, max_iter, False, lam, x, f"Обратные итерации (σ={shift:g})")
+
+
+def rayleigh_quotient_iteration(A, x0=None, shift=None, tol=1e-12, max_iter=50,
+                                seed=None, monitor=None):
+    """
+    Итерации с отношением Рэлея: сдвиг λ^(k) = <A x, x> пересчитывается
+    на каждом шаге (и каждый раз заново раскладывается A - λI).
+
+    shift - начальный сдвиг; по умолчанию отношение Рэлея для x0.
+    Сходится к собственной паре, ближайшей к начальному приближению.
+    """
+    A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    monitor = ConvergenceMonitor() if monitor is None else monitor
+    monitor.start()
+
+    x = _start_vector(n, x0, seed)
+    lam, y = _rayleigh(A, x)
+    if shift is not None:
+        lam = shift
+    for k in range(1, max_iter + 1):
+        with warnings.catch_warnings(), np.errstate(all="ignore"):
+            warnings.simplefilter("ignore")
+            z = lu_solve(lu_factor(A - lam * np.eye(n), check_finite=False), x, check_finite=False)
+        if np.all(np.isfinite(z)) and np.linalg.norm(z) > 0:
+            # Если A - λI вырождена, λ уже собственное значение и x не меняется
+            x = z / np.linalg.norm(z)
+        lam, y = _rayleigh(A, x)
+        residual = np.linalg.norm(y - lam * x)
+        monitor.record(k, residual)
+        if _converged(residual, lam, tol):
+            return _pack(monitor, k, True, lam, x, "Итерации Рэлея")
+    return _pack(monitor, max_iter, False, lam, x, "Итерации Рэлея")
+
+
+def _power_iteration(matvec, n, tol, max_iter, rng):
+    """Степенной метод с остановкой по невязке для оператора matvec."""
+    x = rng.random(n)
+    x /= np.linalg.norm(x)
+    lam = 0.0
+    for k in range(1, max_iter + 1):
+        y = matvec(x)
+        lam = float(x @ y)
+        residual = np.linalg.norm(y - lam * x)
+        if _converged(residual, lam, tol):
+            return lam, x, k
+        norm_y = np.linalg.norm(y)
+        if norm_y == 0:
+            return 0.0, x, k
+        x = y / norm_y
+    return lam, x, max_iter
+
+
+def top_k_eigenpairs(A, k, deflation="hotelling", tol=1e-8, max_iter=1000,
+                     polish=True, seed=None):
+    """
+    k наибольших по модулю собственных пар степенным методом с исчерпыванием.
+
+    Args:
+        deflation: "hotelling" - A_j = A - Σ λ_i v_i v_i^T (для симметричных A,
+            применяется неявно, без изменения A); "wielandt" - явное
+            исчерпывание A_j = A_{j-1} - v a_r^T / v_r (для несимметричных A);
+            собственный вектор w матрицы A_j (значение μ) переводится в
+            вектор A_{j-1}: (μ - λ) w + (a_r^T w / v_r) v.
+        polish: уточнить каждую пару обратными итерациями на исходной A
+            (сдвиг - найденное λ), что убирает накопленную ошибку исчерпывания.
+            Для LinearOperator (безматричный режим) уточнение не выполняется:
+            ему нужно LU-разложение.
+
+    Возвращает список EigenResult в порядке убывания |λ|.
+    """
+    if deflation not in ("hotelling", "wielandt"):
+        raise ValueError(f"Неизвестный способ исчерпывания '{deflation}'")
+    if isinstance(A, LinearOperator):
+        if deflation == "wielandt":
+            raise ValueError("Исчерпывание Виландта требует явной матрицы")
+        polish = False
+    else:
+        A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    if not 1 <= k <= n:
+        raise ValueError("k должно лежать в диапазоне 1..n")
+    rng = np.random.default_rng(seed)
+
+    results = []
+    lambdas, vectors = [], []
+    A_defl = A.copy() if deflation == "wielandt" else None
+    steps = []   # шаги Виландта: (λ, v, r, a_r)
+    for _ in range(k):
+        monitor = ConvergenceMonitor(history_size=0)
+        monitor.start()
+        if deflation == "hotelling":
+            V = np.array(vectors).T if vectors else np.empty((n, 0))
+            L = np.array(lambdas)
+
+            def matvec(x, V=V, L=L):
+                return A @ x - V @ (L * (V.T @ x))
+        else:
+            def matvec(x, B=A_defl):
+                return B @ x
+
+        lam, x, iters = _power_iteration(matvec, n, tol, max_iter, rng)
+
+        if deflation == "wielandt":
+            # x - собственный вектор A_defl; обратный переход через шаги
+            # исчерпывания дает собственный вектор исходной A
+            v = x
+            for lam_j, x_j, r_j, a_j in reversed(steps):
+                v = (lam - lam_j) * v + (a_j @ v / x_j[r_j]) * x_j
+            # Исчерпывание Виландта по строке r с наибольшей |x_r|
+            r = int(np.argmax(np.abs(x)))
+            steps.append((lam, x, r, A_defl[r].copy()))
+            A_defl -= np.outer(x / x[r], A_defl[r])
+            x = v / np.linalg.norm(v)
+
+        if polish:
+            # Малый относительный сдвиг, чтобы A - σI не была вырождена
+            shift = lam * (1 + 1e-10) if lam != 0 else 1e-10
+            polished = inverse_iteration(A, shift, tol=tol, max_iter=50, x0=x)
+            lam, x = polished.eigenvalue, polished.eigenvector
+            iters += polished.iterations
+
+        y = A @ x
+        if deflation == "hotelling":
+            # Для несимметричных A отношение Рэлея не равно λ, поэтому
+            # при исчерпывании Виландта сохраняется найденное λ
+            lam = float(x @ y)
+        residual = np.linalg.norm(y - lam * x)
+        monitor.record(iters, residual)
+        results.append(_pack(monitor, iters, _converged(residual, lam, tol), lam, x,
+                             f"Степенной метод + исчерпывание ({deflation})"))
+        lambdas.append(lam)
+        vectors.append(x)
+    return results
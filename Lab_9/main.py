@@ -1,7 +1,13 @@
+from dataclasses import dataclass
 import numpy as np
 import random
 import math
 
+import _paths  # корень репозитория в sys.path (для utils)
+from utils.convergence import ConvergenceMonitor
+from eigen_solvers import top_k_eigenpairs
+from subspace import block_krylov
+
 # --- КОНСТАНТЫ И ПАРАМЕТРЫ ЗАДАЧИ ---
 N = 6     # Размер матрицы [cite: 31]
 P = 3     # Параметр p [cite: 31]
@@ -10,43 +16,140 @@ B = 0.05  # Параметр b [cite: 31]
 
 EPSILON = 0.001  # Заданная погрешность [cite: 58]
 K_MAX = 100      # Максимальное число итераций [cite: 57]
+SEED = 0         # Зерно начального вектора (воспроизводимость запусков)
+
+def matrix_a_rows(n, p, q, b, start, stop, dtype=float, out=None):
+    """
+    Возвращает строки start..stop-1 (нумерация с 0) матрицы А Варианта 3.
 
-def create_matrix_a(n, p, q, b):
+    (i/j)^p + (j/i)^p = t + 1/t, где t = i^p * j^(-p) - внешнее произведение
+    двух векторов, поэтому полоса строк считается без циклов Python.
+    (Форма (i^2p + j^2p) i^-p j^-p быстрее, но i^2p переполняется уже при
+    2p lg(n) > 308.) Если i^p или j^-p выходит за диапазон float64, t
+    считается как (i/j)^p напрямую.
+    """
+    p = float(p)
+    idx = np.arange(1, n + 1, dtype=np.float64)
+    rows = idx[start:stop]
+
+    if out is None:
+        out = np.empty((stop - start, n), dtype=dtype)
+    # Вычисления ведём в float64, чтобы (i/j)^p не переполнялось в float32
+    t = out if out.dtype == np.float64 else np.empty(out.shape)
+    if p * np.log10(n) < 300:
+        np.multiply.outer(rows ** p, idx ** -p, out=t)
+    else:
+        np.divide.outer(rows, idx, out=t)
+        t **= p
+    t += 1.0 / t
+    # Частые случаи q = 1, 2 без общего (медленного) возведения в степень
+    if float(q) == 2.0:
+        np.sqrt(t, out=t)
+    elif float(q) != 1.0:
+        t **= 1.0 / float(q)
+    np.multiply(t, b, out=out)
+
+    # Диагональные элементы: a_ii = 10 * i^(p/2)
+    k = np.arange(stop - start)
+    out[k, start + k] = 10 * rows ** (p / 2)
+    return out
+
+
+def create_matrix_a(n, p, q, b, dtype=float, block_size=None, out=None):
     """
     Создает квадратную матрицу А размера n*n по формулам Варианта 3.
     Индексы i, j в формулах идут от 1 до n.
+
+    block_size - число строк в полосе блочного режима (None - одним блоком);
+    out - готовый массив (n, n) для записи, например np.memmap.
     """
-    A = np.zeros((n, n))
-    
-    # Для удобства переводим параметры в float для расчетов
-    p_float = float(p)
-    q_float = float(q)
-
-    for i in range(1, n + 1):
-        for j in range(1, n + 1):
-            if i == j:
-                # Диагональные элементы: a_ii = 10 * i^(p/2)
-                A[i-1, j-1] = 10 * (i ** (p_float / 2))
-            else:
-                # Недиагональные элементы: a_ij = b * ((i/j)^p + (j/i)^p)^(1/q)
-                term1 = (i / j) ** p_float
-                term2 = (j / i) ** p_float
-                A[i-1, j-1] = b * ((term1 + term2) ** (1 / q_float))
-                
-    return A
-
-def power_method(A, epsilon, k_max):
+    if out is None:
+        out = np.empty((n, n), dtype=dtype)
+    step = n if block_size is None else max(1, int(block_size))
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        matrix_a_rows(n, p, q, b, start, stop, out=out[start:stop])
+    return out
+
+def aitken(seq):
+    """
+    Экстраполяция Эйткена (Δ²) по трём последним членам последовательности:
+    λ* = λ_k - (Δλ_k)² / (Δ²λ_k).
+    """
+    if len(seq) < 3:
+        return seq[-1]
+    x0, x1, x2 = seq[-3:]
+    denom = x2 - 2 * x1 + x0
+    if denom == 0:
+        return x2
+    return x2 - (x2 - x1) ** 2 / denom
+
+
+def wynn_epsilon(seq, window=7):
+    """
+    ε-алгоритм Винна по последним window членам последовательности.
+    Возвращает оценку из последнего вычисленного чётного столбца таблицы
+    (столбец ε_2 совпадает с экстраполяцией Эйткена).
+    """
+    s = list(seq[-window:])
+    if len(s) < 3:
+        return s[-1]
+    prev = [0.0] * (len(s) + 1)   # столбец ε_{-1}
+    cur = s                       # столбец ε_0
+    best = s[-1]
+    for col in range(1, len(s)):
+        nxt = []
+        for i in range(len(cur) - 1):
+            diff = cur[i + 1] - cur[i]
+            if diff == 0:
+                return cur[i + 1] if col % 2 == 1 else best
+            nxt.append(prev[i + 1] + 1.0 / diff)
+        prev, cur = cur, nxt
+        if col % 2 == 0 and cur:
+            best = cur[-1]
+    return best
+
+
+ACCELERATORS = {"aitken": aitken, "wynn": wynn_epsilon}
+
+
+def power_method(A, epsilon, k_max, monitor=None, rtol=None, accelerate=None,
+                 seed=None, x0=None, full_output=False):
     """
     Реализует степенной метод для нахождения максимального по модулю 
     собственного значения.
+
+    monitor - необязательный ConvergenceMonitor (utils.convergence): получает
+    разность |λ^(k) - λ^(k-1)| на каждой итерации, итог - в monitor.report.
+
+    Дополнительные параметры:
+        rtol: остановка по относительной невязке ||A e - λ e|| <= rtol * |λ|
+            вместо разности соседних λ.
+        accelerate: "aitken" или "wynn" - экстраполяция последовательности λ^(k);
+            критерий |λ*^(k) - λ*^(k-1)| < epsilon применяется к
+            экстраполированным значениям.
+        seed: зерно генератора начального вектора (воспроизводимый запуск).
+        x0: явный начальный вектор.
+        full_output: вернуть PowerResult вместо кортежа.
+
+    Возвращает (λ, собственный вектор (нормированный), число итераций, статус).
     """
     n = A.shape[0]
+    if accelerate is not None and accelerate not in ACCELERATORS:
+        raise ValueError(f"Неизвестный метод ускорения '{accelerate}'")
     
     # 1. Выбор начального вектора x^(0) (случайный, равномерно в (0, 1)) [cite: 53]
-    # Используем numpy.random.rand для создания вектора-столбца.
-    x_k_minus_1 = np.random.rand(n, 1) 
-    lambda_k = 0.0
+    # Генератор с заданным зерном делает запуск воспроизводимым.
+    if x0 is None:
+        x_k_minus_1 = np.random.default_rng(seed).random((n, 1))
+    else:
+        x_k_minus_1 = np.array(x0, dtype=float).reshape(n, 1)
+    lambdas = []          # последовательность λ^(k)
+    estimate = 0.0        # текущая оценка (экстраполированная, если включено)
+    if monitor is not None:
+        monitor.start()
     
+    converged = False
     for k in range(1, k_max + 1):
         
         # --- Шаг 12 (Итерационный процесс) [cite: 67, 71] ---
@@ -62,21 +165,77 @@ def power_method(A, epsilon, k_max):
         # 3. Вычисление нового приближения собственного значения (Скалярное произведение)
         # lambda_1^(k) = <x^(k), e_1^(k-1)>
         lambda_k_new = (x_k.T @ e_k_minus_1)[0, 0]
+        lambdas.append(lambda_k_new)
+        new_estimate = lambda_k_new if accelerate is None else ACCELERATORS[accelerate](lambdas)
         
         # --- Шаг 13 (Проверка условия остановки) [cite: 78, 79] ---
         
         # Разница между текущим и предыдущим lambda
-        diff_lambda = abs(lambda_k_new - lambda_k)
+        diff_lambda = abs(new_estimate - estimate)
+        if monitor is not None:
+            monitor.record(k, diff_lambda)
+        estimate = new_estimate
+
+        if rtol is not None:
+            # Невязка ||A e - λ e||: A e = x^(k) уже вычислено
+            residual = np.linalg.norm(x_k - lambda_k_new * e_k_minus_1)
+            converged = residual <= rtol * abs(lambda_k_new)
+        else:
+            converged = diff_lambda < epsilon and (accelerate is None or k >= 3)
         
-        if diff_lambda < epsilon:
+        if converged:
             # Условие сходимости выполнено
-            return lambda_k_new, x_k, k, "Сходимость достигнута"
+            break
 
-        lambda_k = lambda_k_new
         x_k_minus_1 = x_k # Переход к следующей итерации
     
     # Если цикл закончился по k_max [cite: 58]
-    return lambda_k, x_k, k_max, "k_max достигнут"
+    status = "Сходимость достигнута" if converged else "k_max достигнут"
+    if monitor is not None:
+        monitor.finish(k, converged)
+    eigenvector = x_k / np.linalg.norm(x_k)
+    if not full_output:
+        return estimate, eigenvector, k, status
+    return PowerResult(
+        eigenvalue=estimate,
+        eigenvector=eigenvector,
+        iterations=k,
+        status=status,
+        converged=converged,
+        raw_eigenvalue=lambdas[-1],
+        residual=float(np.linalg.norm(x_k - lambdas[-1] * e_k_minus_1)),
+        iterations_saved=_iterations_saved(lambdas, epsilon) if accelerate and converged else 0,
+    )
+
+
+@dataclass
+class PowerResult:
+    """Подробный результат степенного метода (full_output=True)."""
+    eigenvalue: float        # итоговая (возможно экстраполированная) оценка λ
+    eigenvector: np.ndarray
+    iterations: int
+    status: str
+    converged: bool
+    raw_eigenvalue: float    # последнее λ^(k) без экстраполяции
+    residual: float          # ||A e - λ^(k) e||
+    iterations_saved: int    # оценка итераций, сэкономленных ускорением
+
+
+def _iterations_saved(lambdas, epsilon):
+    """
+    Оценка числа итераций, которое потребовалось бы без ускорения:
+    разности Δλ^(k) убывают примерно как ρ^k (ρ = Δλ^(k) / Δλ^(k-1)),
+    поэтому до |Δλ| < epsilon осталось бы log(epsilon / Δλ) / log(ρ) шагов.
+    """
+    if len(lambdas) < 3:
+        return 0
+    d1 = abs(lambdas[-1] - lambdas[-2])
+    d0 = abs(lambdas[-2] - lambdas[-3])
+    if d1 < epsilon:
+        return 0
+    if d0 == 0 or not 0 < d1 / d0 < 1:
+        return 0
+    return int(math.ceil(math.log(epsilon / d1) / math.log(d1 / d0)))
 
 
 # --- ОСНОВНАЯ ЧАСТЬ ПРОГРАММЫ ---
@@ -94,16 +253,38 @@ if __name__ == "__main__":
     print("--------------------------------------\n")
     
     # 2. Выполнение степенного метода
-    max_eigenvalue, max_eigenvector, iterations, status = power_method(A, EPSILON, K_MAX)
+    monitor = ConvergenceMonitor()
+    max_eigenvalue, max_eigenvector, iterations, status = power_method(A, EPSILON, K_MAX, monitor,
+                                                                       seed=SEED)
     
     # 3. Вывод результатов [cite: 104, 105]
     print(f"--- Результаты решения: ---")
     print(f"Статус завершения: {status}")
     print(f"Число итераций k: {iterations}")
+    print(f"Время: {monitor.report.wall_time * 1e3:.3f} мс, "
+          f"скорость сходимости (множитель за итерацию): {monitor.report.convergence_rate:.4f}")
     print(f"Максимальное собственное значение λ_max: {max_eigenvalue:.8f}")
     print(f"\nСоответствующий собственный вектор x (нормированный на последнем шаге):")
-    # Последний x_k уже является приближением собственного вектора (не нормированным)
-    # Нормируем его для вывода
-    final_eigenvector = max_eigenvector / np.linalg.norm(max_eigenvector)
     with np.printoptions(precision=6, suppress=True):
-        print(final_eigenvector.flatten())
\ No newline at end of file
+        print(max_eigenvector.flatten())
+
+    # Ускорение Эйткена/Винна и остановка по относительной невязке
+    for accelerate in ("aitken", "wynn"):
+        res = power_method(A, EPSILON, K_MAX, accelerate=accelerate, seed=SEED, full_output=True)
+        print(f"{accelerate}: λ = {res.eigenvalue:.8f}, итераций {res.iterations}, "
+              f"сэкономлено ~{res.iterations_saved}")
+    res = power_method(A, EPSILON, K_MAX, rtol=1e-6, seed=SEED, full_output=True)
+    print(f"Невязка rtol=1e-6: λ = {res.eigenvalue:.8f}, итераций {res.iterations}, "
+          f"||Ae - λe|| = {res.residual:.2e}")
+
+    # 4. Несколько наибольших собственных пар (исчерпывание + уточнение)
+    print(f"\n--- Три наибольших собственных значения: ---")
+    for res in top_k_eigenpairs(A, 3, seed=0):
+        print(f"λ = {res.eigenvalue:.8f}  итераций: {res.iterations:4d}  "
+              f"||Ax - λx|| = {res.residual:.2e}")
+
+    # 5. Те же значения блочным методом Ланцоша (все умножения - A @ X)
+    res = block_krylov(A, 3, seed=0)
+    print(f"\n{res.method}: рестартов {res.iterations}, умножений A·x {res.matvecs}")
+    with np.printoptions(precision=8, suppress=True):
+        print("λ:", res.eigenvalues)
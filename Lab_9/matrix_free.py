@@ -0,0 +1,96 @@
+"""
+Безматричный оператор для матриц Лабораторной работы 9.
+
+Матрица create_matrix_a задана формулой
+    a_ii = 10 * i^(p/2),   a_ij = b * ((i/j)^p + (j/i)^p)^(1/q),
+поэтому произведение A @ v можно считать по полосам строк (matrix_a_rows),
+не храня n x n массив: память O(n * tile) вместо O(n^2). Полосы независимы,
+а NumPy отпускает GIL во время вычислений, поэтому их можно считать в пуле
+потоков (workers > 1).
+
+FormulaMatrix - scipy LinearOperator: подходит для power_method (A @ e),
+subspace_iteration/block_krylov и top_k_eigenpairs (исчерпывание
+Хотеллинга). При workers > 1 пул потоков создается при первом умножении;
+по окончании работы его останавливает close().
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+
+from main import matrix_a_rows
+
+# Ограничение на размер одной полосы строк (число элементов)
+MAX_TILE_ELEMENTS = 2 * 1024 * 1024
+
+
+class FormulaMatrix(LinearOperator):
+    """
+    Матрица A(n, p, q, b) Варианта 3 без хранения элементов.
+
+    Args:
+        n, p, q, b: параметры варианта.
+        tile: число строк в полосе; по умолчанию полоса занимает ~16 МБ.
+        workers: число потоков; 1 - последовательный расчёт.
+    """
+
+    symmetric = True   # a_ij = a_ji; subspace_iteration/block_krylov используют eigh
+
+    def __init__(self, n, p, q, b, tile=None, workers=1):
+        super().__init__(dtype=np.dtype(float), shape=(n, n))
+        self.n, self.p, self.q, self.b = n, p, q, b
+        if tile is None:
+            tile = max(1, MAX_TILE_ELEMENTS // n)
+        self.tile = min(n, int(tile))
+        self.workers = max(1, int(workers))
+        # Буфер полосы у каждого потока свой и переиспользуется между вызовами,
+        # поэтому и пул потоков создаётся один раз
+        self._local = threading.local()
+        self._pool = None
+
+    def rows(self, start, stop):
+        """Строки start..stop-1 матрицы A (во внутреннем буфере потока)."""
+        buf = getattr(self._local, "buf", None)
+        if buf is None or buf.shape[0] < stop - start:
+            buf = self._local.buf = np.empty((max(self.tile, stop - start), self.n))
+        return matrix_a_rows(self.n, self.p, self.q, self.b, start, stop,
+                             out=buf[:stop - start])
+
+    def diagonal(self):
+        return 10 * np.arange(1, self.n + 1, dtype=np.float64) ** (self.p / 2)
+
+    def _matmat(self, X):
+        X = np.asarray(X, dtype=float)
+        Y = np.empty((self.n, X.shape[1]))
+
+        def apply_tile(start):
+            stop = min(start + self.tile, self.n)
+            np.matmul(self.rows(start, stop), X, out=Y[start:stop])
+
+        starts = range(0, self.n, self.tile)
+        if self.workers == 1:
+            for start in starts:
+                apply_tile(start)
+        else:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+            list(self._pool.map(apply_tile, starts))
+        return Y
+
+    def close(self):
+        """Останавливает пул потоков (при следующем вызове создается заново)."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _matvec(self, x):
+        return self._matmat(np.asarray(x).reshape(-1, 1)).ravel()
+
+    def _rmatvec(self, x):
+        # Матрица симметрична: a_ij = a_ji
+        return self._matvec(x)
+
+    def _adjoint(self):
+        return self
@@ -0,0 +1,188 @@
+"""
+Блочные методы для многих собственных значений больших матриц
+Лабораторной работы 9.
+
+    subspace_iteration - блочный степенной метод (итерации подпространства)
+                         с ортонормировкой QR и процедурой Рэлея-Ритца;
+    block_krylov       - блочный метод Ланцоша (для симметричных A) или
+                         Арнольди (для несимметричных) с полной
+                         переортогонализацией и рестартами по векторам Ритца.
+
+Вместо k отдельных проходов степенного метода с исчерпыванием вся работа с
+A выполняется произведениями матрица-матрица A @ X (BLAS-3). A может быть
+массивом, разреженной матрицей или scipy LinearOperator. Симметричный
+путь (eigh) выбирается только для симметричных A: по параметру
+symmetric, атрибуту оператора symmetric или проверке (_is_symmetric).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+
+import _paths  # корень репозитория в sys.path (для utils)
+from utils.convergence import ConvergenceMonitor, ConvergenceReport
+
+
+@dataclass
+class SubspaceResult(ConvergenceReport):
+    """k собственных пар; last_value - наибольшая относительная невязка."""
+    eigenvalues: np.ndarray = None
+    eigenvectors: np.ndarray = None   # столбцы - собственные векторы
+    residuals: np.ndarray = None      # ||A x_i - λ_i x_i||
+    matvecs: int = 0                  # число умножений A на вектор
+    method: str = ""
+
+
+def _is_symmetric(A, symmetric):
+    """
+    Симметрична ли A. Оператор может объявить это атрибутом symmetric;
+    иначе для LinearOperator проверяется y^T (A x) = x^T (A y) на двух
+    случайных векторах (одно произведение A @ [x y]).
+    """
+    if symmetric is not None:
+        return symmetric
+    if isinstance(A, LinearOperator):
+        declared = getattr(A, "symmetric", None)
+        if declared is not None:
+            return bool(declared)
+        XY = np.random.default_rng(0).standard_normal((A.shape[0], 2))
+        AXY = A @ XY
+        lhs, rhs = XY[:, 1] @ AXY[:, 0], XY[:, 0] @ AXY[:, 1]
+        scale = np.linalg.norm(AXY) * np.linalg.norm(XY)
+        return bool(abs(lhs - rhs) <= 1e-10 * scale)
+    if hasattr(A, "toarray"):
+        return abs(A - A.T).max() == 0
+    A = np.asarray(A)
+    return np.allclose(A, A.T)
+
+
+def default_block_size(k):
+    """Размер блока по умолчанию: с запасом векторов сверх k."""
+    return max(2 * k, k + 10)
+
+
+def _orthonormal_start(n, p, seed):
+    X = np.random.default_rng(seed).standard_normal((n, p))
+    Q, _ = np.linalg.qr(X)
+    return Q
+
+
+def _rayleigh_ritz(V, AV, k, symmetric):
+    """Векторы и значения Ритца по базису V и AV = A V, k наибольших по модулю."""
+    H = V.T @ AV
+    if symmetric:
+        theta, S = np.linalg.eigh((H + H.T) / 2)
+    else:
+        theta, S = np.linalg.eig(H)
+        if np.all(np.abs(theta.imag) <= 1e-12 * np.abs(theta).max()):
+            theta, S = theta.real, S.real
+    order = np.argsort(-np.abs(theta))[:k]
+    theta, S = theta[order], S[:, order]
+    X, AX = V @ S, AV @ S
+    residuals = np.linalg.norm(AX - X * theta, axis=0)
+    return theta, X, AX, residuals
+
+
+def _relative(residuals, theta):
+    return residuals / np.maximum(np.abs(theta), 1.0)
+
+
+def _finish(monitor, iterations, tol, theta, X, residuals, matvecs, method):
+    rel = _relative(residuals, theta)
+    report = monitor.finish(iterations, bool(np.all(rel <= tol)))
+    return SubspaceResult(**vars(report), eigenvalues=theta, eigenvectors=X,
+                          residuals=residuals, matvecs=matvecs, method=method)
+
+
+def subspace_iteration(A, k, block_size=None, tol=1e-8, max_iter=1000, seed=None,
+                       symmetric=None, monitor=None):
+    """
+    Блочный степенной метод для k наибольших по модулю собственных пар.
+
+    block_size - размер блока p >= k (по умолчанию default_block_size(k)):
+    запас векторов ускоряет сходимость k-го значения (множитель
+    |λ_{p+1} / λ_k| за итерацию); при блоке k + 5 на матрице Лабораторной
+    работы 9 с плотно сгруппированными старшими значениями метод не сходится.
+    Каждая итерация - одно произведение A @ X размера n x p.
+    """
+    n = A.shape[0]
+    p = min(n, block_size or default_block_size(k))
+    if not 1 <= k <= p:
+        raise ValueError("Требуется 1 <= k <= block_size <= n")
+    symmetric = _is_symmetric(A, symmetric)
+    monitor = ConvergenceMonitor() if monitor is None else monitor
+    monitor.start()
+
+    Q = _orthonormal_start(n, p, seed)
+    matvecs = 0
+    for it in range(1, max_iter + 1):
+        AQ = A @ Q
+        matvecs += p
+        theta, X, _, residuals = _rayleigh_ritz(Q, AQ, p, symmetric)
+        worst = float(np.max(_relative(residuals[:k], theta[:k])))
+        monitor.record(it, worst)
+        if worst <= tol:
+            break
+        # span(A Q) - следующее подпространство; поворот к векторам Ритца
+        # не нужен и для несимметричных A может быть плохо обусловлен
+        Q, _ = np.linalg.qr(AQ)
+    return _finish(monitor, it, tol, theta[:k], X[:, :k], residuals[:k], matvecs,
+                   "Итерации подпространства")
+
+
+def block_krylov(A, k, block_size=None, n_blocks=10, tol=1e-8, max_restarts=100,
+                 seed=None, symmetric=None, monitor=None):
+    """
+    Блочный метод Ланцоша/Арнольди с рестартами.
+
+    На каждом рестарте строится ортонормированный базис блочного
+    крыловского подпространства span{X, A X, ..., A^(m-1) X}
+    (m = n_blocks, X - блок из block_size векторов). Ортогонализация -
+    двукратный блочный Грам-Шмидт, проекция H = V^T (A V) - тоже
+    матричными произведениями. Новый стартовый блок - лучшие векторы Ритца;
+    по умолчанию их default_block_size(k) > k: если сохранять только k, то
+    на сгруппированных старших значениях (матрица Лабораторной работы 9)
+    рестарты перестают уменьшать невязку.
+    Память - n * block_size * n_blocks чисел.
+    """
+    n = A.shape[0]
+    b = min(n, block_size or default_block_size(k))
+    if not 1 <= k <= n:
+        raise ValueError("Требуется 1 <= k <= n")
+    m = max(2, min(n_blocks, n // b))
+    symmetric = _is_symmetric(A, symmetric)
+    monitor = ConvergenceMonitor() if monitor is None else monitor
+    monitor.start()
+
+    X = _orthonormal_start(n, b, seed)
+    matvecs = 0
+    for restart in range(1, max_restarts + 1):
+        V_blocks, AV_blocks = [X], []
+        for j in range(m):
+            W = A @ V_blocks[j]
+            matvecs += W.shape[1]
+            AV_blocks.append(W)
+            if j == m - 1:
+                break
+            V = np.hstack(V_blocks)
+            W = W - V @ (V.T @ W)
+            W = W - V @ (V.T @ W)   # повторная ортогонализация
+            Q, R = np.linalg.qr(W)
+            # Отбрасываем направления, линейно зависимые от уже найденных
+            keep = np.abs(np.diag(R)) > 1e-10 * max(1.0, np.abs(R).max())
+            if not np.any(keep):
+                break
+            V_blocks.append(Q[:, keep])
+
+        V = np.hstack(V_blocks[:len(AV_blocks)])
+        AV = np.hstack(AV_blocks)
+        theta, X_ritz, _, residuals = _rayleigh_ritz(V, AV, max(k, b), symmetric)
+        worst = float(np.max(_relative(residuals[:k], theta[:k])))
+        monitor.record(restart, worst)
+        if worst <= tol or V.shape[1] >= n:
+            break
+        X, _ = np.linalg.qr(X_ritz[:, :b].real)
+
+    return _finish(monitor, restart, tol, theta[:k], X_ritz[:, :k], residuals[:k], matvecs,
+                   "Блочный Ланцош" if symmetric else "Блочный Арнольди")
@@ -0,0 +1,278 @@
+"""
+Метод разбиения (SPIKE) для одной очень большой трехдиагональной системы
+и циклическая (периодическая) трехдиагональная система.
+
+Обозначения те же, что в thomas_method (gui_calculater.py):
+    a[i] x[i-1] + b[i] x[i] + c[i] x[i+1] = d[i],   i = 0..n-1.
+
+Прогонка последовательна: каждый шаг зависит от предыдущего, и при
+n ~ 10^8 это 10^8 итераций цикла Python на одном ядре. Метод разбиения
+делит систему на P блоков по m строк (n <= P m). Внутри блока k
+
+    x_k = y_k - x[s-1] v_k - x[e] w_k,
+
+где y_k - решение блока с правой частью d_k, а "спайки" v_k, w_k - решения
+с правыми частями a[s] e_0 и c[e-1] e_{m-1} (связь с соседними блоками;
+s, e - первая строка блока и первая строка следующего). Все блоки
+решаются одновременно прогонкой по стопке (TridiagonalFactorization):
+цикл идет по m строкам, а операции векторизованы по блокам. Группы
+блоков обрабатываются параллельно в пуле потоков или процессов;
+векторы лежат в разделяемой памяти (SharedArray), процессы их не
+копируют. Первые и последние элементы y_k, v_k, w_k дают малую
+пятидиагональную систему на 2P неизвестных - первые и последние
+значения блоков. После ее решения каждый блок решается еще раз с
+известными соседями в правой части.
+
+Метод (как и прогонка без выбора ведущего элемента) устойчив для матриц
+с диагональным преобладанием.
+
+cyclic_solve решает систему с периодическими условиями (a[0] - коэффициент
+при x[n-1], c[n-1] - при x[0]), которую thomas_method решить не может,
+по формуле Шермана - Моррисона: две обычные трехдиагональные системы.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy.linalg import solve_banded
+
+from tridiagonal import TridiagonalFactorization
+
+# Элементов в одной задаче пула (ограничивает временную память прогонки)
+TASK_SIZE = 1 << 22
+
+
+class SharedArray:
+    """
+    Массив float64 в разделяемой памяти (multiprocessing.shared_memory).
+
+    Процесс-владелец создает массив (name=None) и в конце вызывает unlink();
+    другие процессы подключаются по spec() через SharedArray.attach и
+    вызывают close().
+    """
+
+    def __init__(self, shape, name=None):
+        self.shape = tuple(shape)
+        size = max(1, math.prod(self.shape)) * 8
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.array = np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)
+
+    def spec(self):
+        return self.shm.name, self.shape
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape = spec
+        return cls(shape, name=name)
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+
+    def unlink(self):
+        self.close()
+        self.shm.unlink()
+
+
+def _blocks(arrays, start, stop):
+    """Стопки блоков start..stop-1; arrays - массивы (P, m) или spec() SharedArray."""
+    if isinstance(arrays[0], np.ndarray):
+        return [v[start:stop] for v in arrays], []
+    shared = [SharedArray.attach(spec) for spec in arrays]
+    return [s.array[start:stop] for s in shared], shared
+
+
+def _spikes(arrays, start, stop):
+    """Крайние элементы y, v, w блоков start..stop-1: массив (6, stop - start)."""
+    (a, b, c, d, _), shared = _blocks(arrays, start, stop)
+    try:
+        factorization = TridiagonalFactorization(a, b, c)
+        y = factorization.solve(d)
+        e = np.zeros_like(d)
+        e[:, 0] = a[:, 0]
+        v = factorization.solve(e)
+        e[:, 0] = 0.0
+        e[:, -1] = c[:, -1]
+        w = factorization.solve(e)
+        return np.stack([y[:, 0], y[:, -1], v[:, 0], v[:, -1], w[:, 0], w[:, -1]])
+    finally:
+        for s in shared:
+            s.close()
+
+
+def _finish(arrays, start, stop, left, right):
+    """Решение блоков start..stop-1 при известных x[s-1] (left) и x[e] (right)."""
+    (a, b, c, d, x), shared = _blocks(arrays, start, stop)
+    try:
+        rhs = d.copy()
+        rhs[:, 0] -= a[:, 0] * left
+        rhs[:, -1] -= c[:, -1] * right
+        x[:] = TridiagonalFactorization(a, b, c).solve(rhs)
+    finally:
+        for s in shared:
+            s.close()
+
+
+def _reduced_solve(ends):
+    """
+    Решает систему для первых (u[2k]) и последних (u[2k+1]) значений блоков:
+        u[2k]   + v0_k u[2k-1] + w0_k u[2k+2] = y0_k
+        u[2k+1] + v1_k u[2k-1] + w1_k u[2k+2] = y1_k
+    Возвращает соседей блоков: x[s-1] и x[e] (нули у крайних блоков).
+    """
+    y0, y1, v0, v1, w0, w1 = ends
+    P = y0.size
+    ab = np.zeros((5, 2 * P))
+    ab[2] = 1.0
+    ab[0, 2::2] = w0[:-1]
+    ab[1, 2::2] = w1[:-1]
+    ab[3, 1:-1:2] = v0[1:]
+    ab[4, 1:-1:2] = v1[1:]
+    rhs = np.empty(2 * P)
+    rhs[0::2] = y0
+    rhs[1::2] = y1
+    u = solve_banded((2, 2), ab, rhs)
+
+    left, right = np.zeros(P), np.zeros(P)
+    left[1:] = u[1:-1:2]
+    right[:-1] = u[2::2]
+    return left, right
+
+
+def partitioned_solve(a, b, c, d, chunk_size=None, workers=None, pool="process"):
+    """
+    Решает одну трехдиагональную систему методом разбиения.
+
+    Args:
+        a, b, c, d: массивы (n,); a[0] и c[n-1] не используются.
+        chunk_size: строк в блоке (по умолчанию ~sqrt(n), не меньше 2).
+        workers: размер пула (по умолчанию os.cpu_count(); 1 - без пула).
+        pool: "process" (векторы в разделяемой памяти) или "thread".
+
+    Returns:
+        Решение x формы (n,).
+    """
+    a, b, c, d = (np.asarray(v, dtype=float) for v in (a, b, c, d))
+    n = d.shape[0]
+    if not (a.shape == b.shape == c.shape == d.shape == (n,)):
+        raise ValueError("Ожидаются массивы формы (n,) одинаковой длины")
+    if pool not in ("process", "thread"):
+        raise ValueError("pool должен быть 'process' или 'thread'")
+    m = max(2, chunk_size or math.isqrt(n))
+    P = -(-n // m)
+    workers = workers or os.cpu_count() or 1
+
+    # Дополнение до P * m строк уравнениями x = 0, не связанными с системой
+    parallel = workers > 1 and P > 1
+    shared = [SharedArray((P, m)) for _ in range(5)] if parallel and pool == "process" else []
+    try:
+        padded = [s.array for s in shared] or [np.empty((P, m)) for _ in range(5)]
+        for dst, src, fill in zip(padded, (a, b, c, d), (0.0, 1.0, 0.0, 0.0)):
+            flat = dst.reshape(-1)
+            flat[:n] = src
+            flat[n:] = fill
+        padded[0][0, 0] = 0.0
+        padded[2].reshape(-1)[n - 1] = 0.0
+        arrays = [s.spec() for s in shared] or padded
+
+        per_task = max(1, min(TASK_SIZE // m, -(-P // workers)))
+        tasks = [(k, min(k + per_task, P)) for k in range(0, P, per_task)]
+        if parallel:
+            executor_class = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+            executor = executor_class(max_workers=workers)
+        else:
+            executor = None
+        try:
+            mapper = executor.map if executor else map
+            ends = np.concatenate(list(mapper(_spikes, *zip(*((arrays, s, e) for s, e in tasks)))),
+                                  axis=1)
+            left, right = _reduced_solve(ends)
+            list(mapper(_finish, *zip(*((arrays, s, e, left[s:e], right[s:e])
+                                        for s, e in tasks))))
+        finally:
+            if executor:
+                executor.shutdown()
+        return padded[4].reshape(-1)[:n].copy()
+    finally:
+        for s in shared:
+            s.unlink()
+
+
+def cyclic_solve(a, b, c, d, parallel=False, **kwargs):
+    """
+    Решает циклическую трехдиагональную систему (n >= 3):
+        a[0] x[n-1] + b[0] x[0] + c[0] x[1] = d[0],
+        a[n-1] x[n-2] + b[n-1] x[n-1] + c[n-1] x[0] = d[n-1].
+
+    Матрица представляется как T + u v^T с трехдиагональной T; по формуле
+    Шермана - Моррисона x = y - z (v.y) / (1 + v.z), где T y = d, T z = u.
+    При parallel=True обе системы решаются partitioned_solve (kwargs
+    передаются ему), иначе - одной прогонкой с двумя правыми частями.
+    """
+    a, b, c, d = (np.asarray(v, dtype=float) for v in (a, b, c, d))
+    n = d.shape[0]
+    if n < 3:
+        raise ValueError("Циклическая система должна содержать не менее 3 уравнений")
+    top, bottom = a[0], c[n - 1]  # x[n-1] в первой строке, x[0] - в последней
+    gamma = -b[0]
+    bb = b.copy()
+    bb[0] -= gamma
+    bb[n - 1] -= top * bottom / gamma
+    u = np.zeros(n)
+    u[0] = gamma
+    u[n - 1] = bottom
+
+    if parallel:
+        y = partitioned_solve(a, bb, c, d, **kwargs)
+        z = partitioned_solve(a, bb, c, u, **kwargs)
+    else:
+        y, z = TridiagonalFactorization(a, bb, c).solve(np.stack([d, u]))
+    factor = (y[0] + top * y[n - 1] / gamma) / (1.0 + z[0] + top * z[n - 1] / gamma)
+    return y - factor * z
+
+
+if __name__ == "__main__":
+    import time
+
+    from tridiagonal import thomas_batched
+
+    rng = np.random.default_rng(0)
+    n = 10_000_000
+    a, c = -rng.random(n), -rng.random(n)
+    b = 2.5 + rng.random(n)
+    d = rng.random(n)
+
+    t = time.perf_counter()
+    x_ref = thomas_batched(a[:200_000], b[:200_000], c[:200_000], d[:200_000])
+    t_thomas = (time.perf_counter() - t) * n / 200_000
+
+    pool_size = max(2, os.cpu_count() or 1)
+    for workers, pool in ((1, "process"), (pool_size, "process"), (pool_size, "thread")):
+        t = time.perf_counter()
+        x = partitioned_solve(a, b, c, d, workers=workers, pool=pool)
+        elapsed = time.perf_counter() - t
+        r = b * x - d
+        r[1:] += a[1:] * x[:-1]
+        r[:-1] += c[:-1] * x[1:]
+        print(f"n={n}, workers={workers} ({pool}): {elapsed:.2f} с, "
+              f"max|невязка| = {np.abs(r).max():.2e}")
+    print(f"прогонка (оценка по 200000 строкам): {t_thomas:.0f} с")
+
+    # Периодическая задача: сравнение с плотным решением
+    n = 500
+    a, c = -rng.random(n), -rng.random(n)
+    b = 2.5 + rng.random(n)
+    d = rng.random(n)
+    A = np.diag(b) + np.diag(a[1:], -1) + np.diag(c[:-1], 1)
+    A[0, n - 1], A[n - 1, 0] = a[0], c[n - 1]
+    x_dense = np.linalg.solve(A, d)
+    for parallel in (False, True):
+        x = cyclic_solve(a, b, c, d, parallel=parallel, chunk_size=37, workers=2)
+        print(f"циклическая система n={n} (parallel={parallel}): "
+              f"max ошибка = {np.abs(x - x_dense).max():.2e}")
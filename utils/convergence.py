@@ -0,0 +1,105 @@
+"""
+Общий интерфейс наблюдения за сходимостью итерационных методов
+(Зейдель/ПВР/крыловские методы в Lab_8, степенной метод в Lab_9,
+метод Якоби в Lab_10).
+
+Решатель получает необязательный ConvergenceMonitor и вызывает:
+    monitor.start()                  - перед первой итерацией;
+    monitor.record(k, value)         - после итерации k (value - невязка
+                                       или разность приближений);
+    monitor.finish(k, converged)     - по окончании; итог в monitor.report.
+
+Если монитор не передан, решатель не делает лишних вызовов. Если передан
+без callback и без истории, record() только запоминает первое и последнее
+значение - этого достаточно для оценки скорости сходимости.
+"""
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ConvergenceReport:
+    """Итог итерационного процесса."""
+    iterations: int
+    converged: bool
+    wall_time: float = 0.0           # полное время, с
+    time_per_iteration: float = 0.0  # среднее время итерации, с
+    last_value: float = math.nan     # последняя невязка / разность
+    convergence_rate: float = math.nan  # средний множитель уменьшения за итерацию
+    history: list = field(default_factory=list)  # [(k, value, elapsed), ...]
+
+
+class ConvergenceMonitor:
+    """
+    Наблюдатель за сходимостью.
+
+    Args:
+        callback: функция callback(iteration, value, elapsed), вызываемая
+            при каждой записи.
+        history_size: сколько последних записей хранить (кольцевой буфер);
+            None - хранить все, 0 - не хранить.
+    """
+
+    def __init__(self, callback=None, history_size=None):
+        self.callback = callback
+        self.history_size = history_size
+        self.history = None if history_size == 0 else deque(maxlen=history_size)
+        self.report = None
+        self._t_start = None
+        self._first = None
+        self._last = None
+
+    def start(self):
+        """Сбрасывает состояние и запускает таймер."""
+        if self.history is not None:
+            self.history.clear()
+        self.report = None
+        self._first = self._last = None
+        self._t_start = time.perf_counter()
+
+    def elapsed(self):
+        return time.perf_counter() - self._t_start
+
+    def record(self, iteration, value):
+        """Записывает значение невязки (разности) после итерации iteration."""
+        self._last = (iteration, value)
+        if self._first is None:
+            self._first = self._last
+        if self.callback is None and self.history is None:
+            return
+        elapsed = self.elapsed()
+        if self.history is not None:
+            self.history.append((iteration, value, elapsed))
+        if self.callback is not None:
+            self.callback(iteration, value, elapsed)
+
+    def convergence_rate(self):
+        """
+        Средний множитель уменьшения невязки за итерацию:
+        (r_last / r_first)^(1 / (k_last - k_first)).
+        """
+        if self._first is None or self._last is None:
+            return math.nan
+        (k0, v0), (k1, v1) = self._first, self._last
+        if k1 <= k0 or v0 <= 0 or v1 < 0:
+            return math.nan
+        if v1 == 0:
+            return 0.0
+        return (v1 / v0) ** (1.0 / (k1 - k0))
+
+    def finish(self, iterations, converged):
+        """Формирует итоговый ConvergenceReport (доступен в self.report)."""
+        wall_time = self.elapsed()
+        self.report = ConvergenceReport(
+            iterations=iterations,
+            converged=converged,
+            wall_time=wall_time,
+            time_per_iteration=wall_time / iterations if iterations else 0.0,
+            last_value=math.nan if self._last is None else self._last[1],
+            convergence_rate=self.convergence_rate(),
+            history=[] if self.history is None else list(self.history),
+        )
+        return self.report